@@ -0,0 +1,257 @@
+import json
+import os
+import socket
+import socketserver
+import struct
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from app.utils.config import AppConfig
+from app.utils.logger import get_logger
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+DAEMON_SUPPORTED = hasattr(socket, "AF_UNIX")
+
+_HEADER = struct.Struct("!I")
+_CONNECT_TIMEOUT = 0.5
+_RESPONSE_TIMEOUT = 300.0
+_SPAWN_TIMEOUT = 10.0
+
+
+def get_socket_path() -> Path:
+    return AppConfig.STATE_DIR / "search.sock"
+
+
+def _send_message(sock: socket.socket, message: Dict[str, Any]) -> None:
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        payload = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = sock.recv(min(remaining, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Connection closed before message was complete")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv_message(sock: socket.socket) -> Dict[str, Any]:
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    payload = _recv_exact(sock, size)
+    return orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(payload)
+
+
+class _SearchRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        try:
+            request = _recv_message(self.request)
+            response = self.server.execute(request)
+        except Exception as e:
+            logger.error(f"Daemon request failed: {e}")
+            response = {"ok": False, "error": str(e)}
+
+        try:
+            _send_message(self.request, response)
+        except OSError as e:
+            logger.warning(f"Failed to send daemon response: {e}")
+
+
+if DAEMON_SUPPORTED:
+    class SearchDaemon(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+        def __init__(self, socket_path: Optional[Path] = None):
+            self.socket_path = Path(socket_path or get_socket_path())
+            self.socket_path.parent.mkdir(exist_ok=True, parents=True)
+            self._remove_stale_socket()
+
+            self._managers: Dict[str, Any] = {}
+            # AppConfig is process-global, so config loading and the search
+            # itself must not interleave across projects
+            self._search_lock = threading.Lock()
+
+            super().__init__(str(self.socket_path), _SearchRequestHandler)
+
+        def _remove_stale_socket(self):
+            if not self.socket_path.exists():
+                return
+
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.settimeout(_CONNECT_TIMEOUT)
+                probe.connect(str(self.socket_path))
+            except OSError:
+                self.socket_path.unlink()
+                return
+            finally:
+                probe.close()
+
+            raise RuntimeError(f"Search daemon already running at {self.socket_path}")
+
+        def _get_manager(self, project_path: str):
+            from app.core.search_manager import SearchManager
+
+            manager = self._managers.get(project_path)
+            if manager is None:
+                logger.info(f"Daemon loading search engine for: {project_path}")
+                manager = SearchManager(project_path)
+                self._managers[project_path] = manager
+            return manager
+
+        def execute(self, request: Dict[str, Any]) -> Dict[str, Any]:
+            project_path = request["project_path"]
+
+            with self._search_lock:
+                AppConfig.ensure_config_loaded(project_path)
+                manager = self._get_manager(project_path)
+                manager.refresh_index()
+                search_result = manager.execute_search(
+                    query=request["query"],
+                    mode=request.get("mode", "hybrid"),
+                    limit=request.get("limit", 10),
+                    validate_model=True,
+                    language=request.get("language")
+                )
+
+            results = []
+            for result in search_result.results:
+                result = dict(result)
+                result.pop("vector", None)
+                results.append(result)
+
+            return {
+                "ok": True,
+                "results": results,
+                "validation": asdict(search_result.validation) if search_result.validation else None,
+                "total_results": search_result.total_results,
+                "execution_time_ms": search_result.execution_time_ms
+            }
+
+        def server_close(self):
+            super().server_close()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+
+
+def spawn_daemon() -> bool:
+    socket_path = get_socket_path()
+    codebox_script = Path(__file__).resolve().parents[2] / "codebox.py"
+
+    try:
+        subprocess.Popen(
+            [sys.executable, str(codebox_script), "daemon"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+    except OSError as e:
+        logger.warning(f"Failed to start search daemon: {e}")
+        return False
+
+    deadline = time.monotonic() + _SPAWN_TIMEOUT
+    while time.monotonic() < deadline:
+        if socket_path.exists():
+            return True
+        time.sleep(0.05)
+
+    logger.warning("Search daemon did not start in time, searching in-process")
+    return False
+
+
+def _connect(socket_path: Path) -> Optional[socket.socket]:
+    if not socket_path.exists():
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(_CONNECT_TIMEOUT)
+        sock.connect(str(socket_path))
+    except OSError as e:
+        sock.close()
+        logger.debug(f"Search daemon unavailable: {e}")
+        if isinstance(e, ConnectionRefusedError):
+            # Left behind by a daemon that died without cleaning up
+            try:
+                socket_path.unlink()
+            except OSError:
+                pass
+        return None
+
+    return sock
+
+
+def request_search(
+    project_path: str,
+    query: str,
+    mode: str,
+    limit: int,
+    language: Optional[str] = None,
+    autostart: bool = False
+):
+    if not DAEMON_SUPPORTED:
+        return None
+
+    socket_path = get_socket_path()
+    sock = _connect(socket_path)
+    if sock is None:
+        if not autostart or not spawn_daemon():
+            return None
+        sock = _connect(socket_path)
+        if sock is None:
+            return None
+
+    from app.core.search_result import SearchResult
+    from app.core.model_validator import ModelValidationResult
+
+    try:
+        sock.settimeout(_RESPONSE_TIMEOUT)
+        _send_message(sock, {
+            "project_path": project_path,
+            "query": query,
+            "mode": mode,
+            "limit": limit,
+            "language": language
+        })
+        response = _recv_message(sock)
+    except (OSError, ValueError) as e:
+        logger.debug(f"Search daemon request failed, searching in-process: {e}")
+        return None
+    finally:
+        sock.close()
+
+    if not response.get("ok"):
+        logger.warning(
+            f"Search daemon error, searching in-process: {response.get('error', 'unknown error')}"
+        )
+        return None
+
+    validation = response.get("validation")
+    return SearchResult(
+        results=response["results"],
+        validation=ModelValidationResult(**validation) if validation else None,
+        total_results=response["total_results"],
+        execution_time_ms=response["execution_time_ms"]
+    )
@@ -1,21 +1,20 @@
-import json
 import sys
 import time
 import signal
+import threading
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Iterator, TYPE_CHECKING
 from datetime import datetime
-from app.indexer.indexer import CoreIndexer, IndexingCallbacks
-from app.indexer.auto_sync import AutoSyncWorker
 from app.utils.config import AppConfig
 from app.utils.project_manager import ProjectManager
 from app.utils.logger import get_logger
-from app.core.indexing_manager import IndexingManager
-from app.core.search_manager import SearchManager
-from app.core.result_formatter import process_cli_results
-from app.core.stats_manager import StatsManager
-from app.core.cli_helpers import CLIErrorHandler, CLIProjectPathResolver
+from app.core.result_formatter import iter_cli_results, clear_context_cache
+from app.core.cli_helpers import CLIErrorHandler, CLIProjectPathResolver, write_json
 from app.core.model_validator import ModelValidator
+from app.cli.daemon import request_search, DAEMON_SUPPORTED
+
+if TYPE_CHECKING:
+    from app.core.search_manager import SearchManager
 
 logger = get_logger(__name__)
 
@@ -25,7 +24,7 @@ class CLIHandler:
         AppConfig.init_directories()
         self.project_manager = ProjectManager(cli_mode=True)
         self.path_resolver = CLIProjectPathResolver(self.project_manager)
-        self.search_manager: Optional[SearchManager] = None
+        self.search_manager: Optional["SearchManager"] = None
 
     def search(
         self,
@@ -34,68 +33,222 @@ class CLIHandler:
         limit: int = 10,
         full_content: bool = False,
         context: int = 0,
-        output: str = "compact"
+        output: str = "compact",
+        language: Optional[str] = None,
+        start_daemon: bool = False
     ):
         try:
-            search_start = time.time()
             project_path = self.path_resolver.get_path()
+            output_data = self._run_search(
+                project_path, query, mode, limit, full_content, context, output, language,
+                start_daemon
+            )
+            CLIErrorHandler.handle_success_stream(output_data, "results", clean_code=True)
 
-            if not self.search_manager:
-                self.search_manager = SearchManager(project_path)
+        except Exception as e:
+            CLIErrorHandler.handle_error("Search", e)
+        finally:
+            clear_context_cache()
 
-            search_result = self.search_manager.execute_search(
+    def search_stream(
+        self,
+        mode: str = "hybrid",
+        limit: int = 10,
+        full_content: bool = False,
+        context: int = 0,
+        output: str = "compact",
+        language: Optional[str] = None,
+        start_daemon: bool = False
+    ):
+        try:
+            project_path = self.path_resolver.get_path()
+        except Exception as e:
+            CLIErrorHandler.handle_error("Search stream", e)
+            return
+
+        for line in sys.stdin:
+            query = line.strip()
+            if not query:
+                continue
+
+            try:
+                output_data = self._run_search(
+                    project_path, query, mode, limit, full_content, context, output, language,
+                    start_daemon
+                )
+                output_data["results"] = list(output_data["results"])
+            except Exception as e:
+                logger.error(f"Search failed for query '{query}': {e}")
+                output_data = {
+                    "success": False,
+                    "query": query,
+                    "error": str(e)
+                }
+            finally:
+                clear_context_cache()
+
+            write_json(output_data, pretty=False)
+
+    def _run_search(
+        self,
+        project_path: str,
+        query: str,
+        mode: str,
+        limit: int,
+        full_content: bool,
+        context: int,
+        output: str,
+        language: Optional[str],
+        start_daemon: bool = False
+    ) -> dict:
+        search_start = time.perf_counter_ns()
+
+        search_result = request_search(
+            project_path, query, mode, limit, language,
+            autostart=start_daemon or AppConfig.SEARCH_DAEMON_AUTOSTART
+        )
+
+        if search_result is not None and "lancedb" in sys.modules:
+            # The daemon client must stay light, or it saves nothing over an
+            # in-process search
+            logger.warning("Daemon-served search imported lancedb in the client")
+
+        if search_result is None:
+            # Loading the search stack is start-up cost, not search time
+            load_start = time.perf_counter_ns()
+            search_manager = self._get_search_manager(project_path)
+            search_start += time.perf_counter_ns() - load_start
+
+            search_result = search_manager.execute_search(
                 query=query,
                 mode=mode,
                 limit=limit,
-                validate_model=True
+                validate_model=True,
+                language=language
             )
 
-            preview_length = 800
-            preview_lines = 20
-
-            if output == "compact":
-                preview_length = 150
-                preview_lines = 3
-                full_content = False
-            elif output == "standard":
-                preview_length = 800
-                preview_lines = 15
-                full_content = False
-            elif output == "verbose":
-                full_content = True
-
-            results_with_context = process_cli_results(
-                results=search_result.results,
+        # Formatted lazily so the caller can write each result as it is built
+        results_with_context = self._format_results(
+            search_result.results, mode, project_path, context, output, full_content
+        )
+
+        elapsed_ns = time.perf_counter_ns() - search_start
+        results_count = len(search_result.results)
+
+        return {
+            "success": True,
+            "query": query,
+            "mode": mode,
+            "count": results_count,
+            "performance": {
+                "search_duration_ms": round(search_result.execution_time_ms, 2),
+                "total_duration_ms": round(elapsed_ns / 1e6, 2),
+                "results_count": results_count,
+                "results_per_second": round(results_count * 1e9 / max(elapsed_ns, 1), 2)
+            },
+            "model": ModelValidator.format_model_info_for_json(search_result.validation),
+            "results": results_with_context
+        }
+
+    def search_batch(
+        self,
+        mode: str = "hybrid",
+        limit: int = 10,
+        full_content: bool = False,
+        context: int = 0,
+        output: str = "compact",
+        language: Optional[str] = None
+    ):
+        try:
+            queries = [line.strip() for line in sys.stdin if line.strip()]
+
+            project_path = self.path_resolver.get_path()
+            search_manager = self._get_search_manager(project_path)
+
+            batch_start = time.perf_counter_ns()
+            search_results = search_manager.execute_search_batch(
+                queries=queries,
                 mode=mode,
-                project_path=project_path,
-                context=context,
-                preview_length=preview_length,
-                preview_lines=preview_lines,
-                full_content=full_content,
-                max_content_length=AppConfig.CLI_MAX_CONTENT_LENGTH,
-                output_format=output
+                limit=limit,
+                validate_model=True,
+                language=language
             )
 
-            total_time = (time.time() - search_start) * 1000
+            batch_output = []
+            results_count = 0
+            for query, search_result in zip(queries, search_results):
+                results_count += search_result.total_results
+                batch_output.append({
+                    "query": query,
+                    "count": search_result.total_results,
+                    "search_duration_ms": round(search_result.execution_time_ms, 2),
+                    "results": list(self._format_results(
+                        search_result.results, mode, project_path, context, output, full_content
+                    ))
+                })
+
+            elapsed_ns = time.perf_counter_ns() - batch_start
 
             output_data = {
                 "success": True,
-                "query": query,
                 "mode": mode,
-                "count": len(search_result.results),
+                "count": len(batch_output),
                 "performance": {
-                    "search_duration_ms": round(search_result.execution_time_ms, 2),
-                    "total_duration_ms": round(total_time, 2),
-                    "results_count": len(search_result.results),
-                    "results_per_second": round(len(search_result.results) / max((time.time() - search_start), 0.001), 2)
+                    "total_duration_ms": round(elapsed_ns / 1e6, 2),
+                    "queries_count": len(batch_output),
+                    "results_count": results_count,
+                    "queries_per_second": round(len(batch_output) * 1e9 / max(elapsed_ns, 1), 2)
                 },
-                "model": ModelValidator.format_model_info_for_json(search_result.validation),
-                "results": results_with_context
+                "model": ModelValidator.format_model_info_for_json(search_results[0].validation),
+                "queries": batch_output
             }
-            CLIErrorHandler.handle_success(output_data)
+            CLIErrorHandler.handle_success(output_data, clean_code=True)
 
         except Exception as e:
-            CLIErrorHandler.handle_error("Search", e)
+            CLIErrorHandler.handle_error("Batch search", e)
+        finally:
+            clear_context_cache()
+
+    def _get_search_manager(self, project_path: str) -> "SearchManager":
+        if not self.search_manager:
+            from app.core.search_manager import SearchManager
+            self.search_manager = SearchManager(project_path)
+        return self.search_manager
+
+    @staticmethod
+    def _format_results(
+        results: List[dict],
+        mode: str,
+        project_path: str,
+        context: int,
+        output: str,
+        full_content: bool
+    ) -> Iterator[dict]:
+        preview_length = 800
+        preview_lines = 20
+
+        if output == "compact":
+            preview_length = 150
+            preview_lines = 3
+            full_content = False
+        elif output == "standard":
+            preview_length = 800
+            preview_lines = 15
+            full_content = False
+        elif output == "verbose":
+            full_content = True
+
+        return iter_cli_results(
+            results=results,
+            mode=mode,
+            project_path=project_path,
+            context=context,
+            preview_length=preview_length,
+            preview_lines=preview_lines,
+            full_content=full_content,
+            max_content_length=AppConfig.CLI_MAX_CONTENT_LENGTH,
+            output_format=output
+        )
 
     def index(
         self,
@@ -113,62 +266,17 @@ class CLIHandler:
 
             if is_indexed:
                 logger.info("Project already indexed. Starting auto-sync...")
-                print(json.dumps({
+                write_json({
                     "success": True,
                     "message": "Project already indexed. Auto-sync started.",
                     "indexed_at": metadata.get("indexed_at"),
                     "project_path": project_path
-                }, indent=2, ensure_ascii=False))
+                })
                 print()
                 self.auto_sync()
                 return
 
-            indexing_ctx = IndexingManager.prepare_indexing(project_path)
-
-            class ProgressBarCallbacks(IndexingCallbacks):
-                def __init__(self):
-                    self.indexed_count = 0
-                    self.failed_count = 0
-                    self.skipped_count = 0
-
-                def on_progress(self, current: int, total: int, filename: str):
-                    pass
-
-                def on_file_processed(self, filename: str, status: str, chunks: int):
-                    if status == "indexed":
-                        self.indexed_count += 1
-                    elif status == "failed":
-                        self.failed_count += 1
-                    elif status == "skipped":
-                        self.skipped_count += 1
-
-                def on_log(self, message: str):
-                    pass
-
-            callbacks = ProgressBarCallbacks()
-            indexer = CoreIndexer(indexing_ctx.project_path)
-            result = indexer.index(callbacks=callbacks)
-
-            if not result.success:
-                raise Exception(result.error)
-
-            IndexingManager.finalize_indexing(indexing_ctx.project_path, success=True)
-
-            CLIErrorHandler.handle_success({
-                "project_path": result.project_path,
-                "project_hash": AppConfig.get_project_hash(result.project_path),
-                "files_processed": result.total_files,
-                "chunks_indexed": result.total_chunks,
-                "embedding_model": result.embedding_model,
-                "database_location": result.database_location,
-                "indexed_files": result.indexed_files_count,
-                "failed_files": result.failed_files_count,
-                "skipped_files": result.skipped_files_count,
-                "processing_time_ms": round(result.processing_time_ms, 2),
-                "embedding_time_ms": round(result.embedding_time_ms, 2),
-                "language_breakdown": result.language_breakdown,
-                "failed_files_details": result.failed_files if result.failed_files_count > 0 else None
-            })
+            CLIErrorHandler.handle_success(self._run_indexing(project_path))
 
         except Exception as e:
             CLIErrorHandler.handle_error("Indexing", e)
@@ -194,61 +302,51 @@ class CLIHandler:
 
             AppConfig.get_project_dir(project_path).mkdir(exist_ok=True, parents=True)
 
-            indexing_ctx = IndexingManager.prepare_indexing(project_path)
-
-            class ProgressBarCallbacks(IndexingCallbacks):
-                def __init__(self):
-                    self.indexed_count = 0
-                    self.failed_count = 0
-                    self.skipped_count = 0
-
-                def on_progress(self, current: int, total: int, filename: str):
-                    pass
-
-                def on_file_processed(self, filename: str, status: str, chunks: int):
-                    if status == "indexed":
-                        self.indexed_count += 1
-                    elif status == "failed":
-                        self.failed_count += 1
-                    elif status == "skipped":
-                        self.skipped_count += 1
-
-                def on_log(self, message: str):
-                    pass
-
-            callbacks = ProgressBarCallbacks()
-            indexer = CoreIndexer(indexing_ctx.project_path)
-            result = indexer.index(callbacks=callbacks)
-
-            if not result.success:
-                raise Exception(result.error)
-
-            IndexingManager.finalize_indexing(indexing_ctx.project_path, success=True)
-
             CLIErrorHandler.handle_success({
                 "message": "Re-indexing completed successfully",
-                "project_path": result.project_path,
-                "project_hash": AppConfig.get_project_hash(result.project_path),
-                "files_processed": result.total_files,
-                "chunks_indexed": result.total_chunks,
-                "embedding_model": result.embedding_model,
-                "database_location": result.database_location,
-                "indexed_files": result.indexed_files_count,
-                "failed_files": result.failed_files_count,
-                "skipped_files": result.skipped_files_count,
-                "processing_time_ms": round(result.processing_time_ms, 2),
-                "embedding_time_ms": round(result.embedding_time_ms, 2),
-                "language_breakdown": result.language_breakdown,
-                "failed_files_details": result.failed_files if result.failed_files_count > 0 else None
+                **self._run_indexing(project_path)
             })
 
         except Exception as e:
             CLIErrorHandler.handle_error("Re-indexing", e)
 
+    @staticmethod
+    def _run_indexing(project_path: str) -> dict:
+        from app.indexer.indexer import CoreIndexer, IndexingCallbacks
+        from app.core.indexing_manager import IndexingManager
+
+        indexing_ctx = IndexingManager.prepare_indexing(project_path)
+
+        indexer = CoreIndexer(indexing_ctx.project_path)
+        result = indexer.index(callbacks=IndexingCallbacks())
+
+        if not result.success:
+            raise Exception(result.error)
+
+        IndexingManager.finalize_indexing(indexing_ctx.project_path, success=True)
+
+        return {
+            "project_path": result.project_path,
+            "project_hash": AppConfig.get_project_hash(result.project_path),
+            "files_processed": result.total_files,
+            "chunks_indexed": result.total_chunks,
+            "embedding_model": result.embedding_model,
+            "database_location": result.database_location,
+            "indexed_files": result.indexed_files_count,
+            "failed_files": result.failed_files_count,
+            "skipped_files": result.skipped_files_count,
+            "processing_time_ms": round(result.processing_time_ms, 2),
+            "embedding_time_ms": round(result.embedding_time_ms, 2),
+            "language_breakdown": result.language_breakdown,
+            "failed_files_details": result.failed_files if result.failed_files_count > 0 else None
+        }
+
     def stats(self):
         try:
             project_path = self.path_resolver.get_path()
 
+            from app.core.stats_manager import StatsManager
+
             full_stats = StatsManager.get_full_stats(project_path)
 
             CLIErrorHandler.handle_success({
@@ -259,6 +357,33 @@ class CLIHandler:
         except Exception as e:
             CLIErrorHandler.handle_error("Stats", e)
 
+    def daemon(self):
+        try:
+            if not DAEMON_SUPPORTED:
+                raise RuntimeError("Search daemon requires Unix domain socket support")
+
+            from app.cli.daemon import SearchDaemon
+
+            server = SearchDaemon()
+
+            def signal_handler(sig, frame):
+                raise KeyboardInterrupt
+
+            signal.signal(signal.SIGTERM, signal_handler)
+
+            print(f"Search daemon listening on {server.socket_path} (Ctrl+C to stop)")
+            sys.stdout.flush()
+
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                print("\nStopping search daemon...")
+            finally:
+                server.server_close()
+
+        except Exception as e:
+            CLIErrorHandler.handle_error("Daemon", e)
+
     def auto_sync(self):
         try:
             project_path = self.path_resolver.get_path()
@@ -279,23 +404,31 @@ class CLIHandler:
                 else:
                     print(f"[{timestamp}] Synced {len(batch_files)} files, {chunks_updated} chunks updated")
 
+            from app.indexer.auto_sync import AutoSyncWorker
+
+            stop_event = threading.Event()
+
             worker = AutoSyncWorker(
                 project_path=project_path,
-                on_sync_complete=on_sync_complete
+                on_sync_complete=on_sync_complete,
+                on_stopped=stop_event.set
             )
 
             def signal_handler(sig, frame):
-                print("\n\nStopping auto-sync...")
-                worker.stop()
-                print("Auto-sync stopped.")
-                sys.exit(0)
+                stop_event.set()
 
             signal.signal(signal.SIGINT, signal_handler)
 
             worker.start()
+            # A timeout keeps the wait interruptible by Ctrl+C on Windows
+            while not stop_event.wait(0.5):
+                pass
 
-            while worker.is_alive():
-                time.sleep(1)
+            if worker.is_alive():
+                print("\n\nStopping auto-sync...")
+                worker.stop()
+                worker.join(timeout=10.0)
+                print("Auto-sync stopped.")
 
         except Exception as e:
             CLIErrorHandler.handle_error("Auto-sync", e)
@@ -1,24 +1,34 @@
-from .file_filters import (
-    get_all_supported_extensions,
-    should_ignore,
-    find_files,
-    should_process_file,
-    get_watch_patterns,
-    get_ignore_patterns
-)
-from .file_processor import FileProcessor
-from .result_formatter import calculate_score, get_context_lines
-from .search_factory import create_search_engine
+import importlib
 
-__all__ = [
-    'get_all_supported_extensions',
-    'should_ignore',
-    'find_files',
-    'should_process_file',
-    'get_watch_patterns',
-    'get_ignore_patterns',
-    'FileProcessor',
-    'calculate_score',
-    'get_context_lines',
-    'create_search_engine',
-]
+# Submodules pull in tree-sitter, Pygments and LanceDB, so they are imported
+# on first attribute access (PEP 562) rather than whenever app.core.* loads
+_LAZY_ATTRS = {
+    'get_all_supported_extensions': '.file_filters',
+    'should_ignore': '.file_filters',
+    'find_files': '.file_filters',
+    'should_process_file': '.file_filters',
+    'get_watch_patterns': '.file_filters',
+    'get_watch_regex': '.file_filters',
+    'get_ignore_patterns': '.file_filters',
+    'FileProcessor': '.file_processor',
+    'calculate_score': '.result_formatter',
+    'calculate_scores': '.result_formatter',
+    'get_context_lines': '.result_formatter',
+    'create_search_engine': '.search_factory',
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,70 +1,224 @@
 import json
 import sys
 import re
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from app.utils.logger import get_logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 logger = get_logger(__name__)
 
+_WRITE_BLOCK_SIZE = 64 * 1024
 
-def pretty_print_with_clean_code(data: Dict[str, Any]) -> str:
-    def serialize(obj, indent=0):
-        indent_str = "  " * indent
-        next_indent_str = "  " * (indent + 1)
-
-        if isinstance(obj, dict):
-            if not obj:
-                return "{}"
-
-            lines = ["{"]
-            items = list(obj.items())
-
-            for i, (key, value) in enumerate(items):
-                is_last = i == len(items) - 1
-                comma = "" if is_last else ","
-
-                if (key == "code" or key == "content") and isinstance(value, list):
-                    lines.append(f'{next_indent_str}"{key}": [')
-                    for code_line in value:
-                        lines.append(f'{next_indent_str}  {code_line}')
-                    lines.append(f'{next_indent_str}]{comma}')
-                else:
-                    serialized = serialize(value, indent + 1)
-                    if isinstance(value, (dict, list)) and value:
-                        lines.append(f'{next_indent_str}"{key}": {serialized}{comma}')
-                    else:
-                        lines.append(f'{next_indent_str}"{key}": {serialized}{comma}')
-
-            lines.append(f'{indent_str}}}')
-            return '\n'.join(lines)
-
-        elif isinstance(obj, list):
-            if not obj:
-                return "[]"
-
-            if all(isinstance(item, dict) for item in obj):
-                lines = ["["]
-                for i, item in enumerate(obj):
-                    is_last = i == len(obj) - 1
-                    comma = "" if is_last else ","
-                    serialized = serialize(item, indent + 1)
-                    item_lines = serialized.split('\n')
-                    for j, line in enumerate(item_lines):
-                        if j == 0:
-                            lines.append(f'{next_indent_str}{line}')
-                        else:
-                            lines.append(f'{next_indent_str}{line}')
-                    if not is_last:
-                        lines[-1] = lines[-1].rstrip('}') + '},'
-                lines.append(f'{indent_str}]')
-                return '\n'.join(lines)
+_force_compact = False
+
+
+def _encode_scalar(value: Any) -> str:
+    # orjson escapes strings exactly like json.dumps(ensure_ascii=False) but
+    # formats some floats differently, so only strings take the fast path
+    if ORJSON_AVAILABLE and type(value) is str:
+        try:
+            return orjson.dumps(value).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _emit_clean_code(obj: Any, indent: int, extra: str, append) -> None:
+    # `extra` is the indentation every continuation line of a nested value
+    # inherits from enclosing lists of dicts
+    indent_str = "  " * indent
+    next_indent_str = "  " * (indent + 1)
+
+    if isinstance(obj, dict):
+        if not obj:
+            append("{}")
+            return
+
+        append("{")
+        last = len(obj) - 1
+        for i, (key, value) in enumerate(obj.items()):
+            comma = "" if i == last else ","
+            append(f'\n{extra}{next_indent_str}"{key}": ')
+
+            if (key == "code" or key == "content") and isinstance(value, list):
+                append("[")
+                for code_line in value:
+                    code_line = str(code_line)
+                    if extra and "\n" in code_line:
+                        code_line = code_line.replace("\n", "\n" + extra)
+                    append(f'\n{extra}{next_indent_str}  {code_line}')
+                append(f'\n{extra}{next_indent_str}]{comma}')
             else:
-                return json.dumps(obj, ensure_ascii=False)
+                _emit_clean_code(value, indent + 1, extra, append)
+                append(comma)
 
+        append(f'\n{extra}{indent_str}}}')
+
+    elif isinstance(obj, list):
+        if not obj:
+            append("[]")
+            return
+
+        if all(isinstance(item, dict) for item in obj):
+            append("[")
+            item_extra = extra + next_indent_str
+            last = len(obj) - 1
+            for i, item in enumerate(obj):
+                append(f'\n{item_extra}')
+                _emit_clean_code(item, indent + 1, item_extra, append)
+                if i != last:
+                    append(",")
+            append(f'\n{extra}{indent_str}]')
         else:
-            return json.dumps(obj, ensure_ascii=False)
+            append(json.dumps(obj, ensure_ascii=False))
+
+    else:
+        append(_encode_scalar(obj))
+
+
+def pretty_print_with_clean_code(data: Dict[str, Any]) -> str:
+    # Single pass into one buffer
+    out = []
+    _emit_clean_code(data, 0, "", out.append)
+    return "".join(out)
+
+
+def stdout_is_tty() -> bool:
+    try:
+        return sys.stdout.isatty()
+    except Exception:
+        return False
+
+
+def set_compact_output(enabled: bool = True) -> None:
+    global _force_compact
+    _force_compact = enabled
+
+
+def write_stdout_bytes(payload: bytes, flush: bool = True) -> None:
+    # Pending text must go out first so output stays in order; after that the
+    # payload is one write to the binary buffer (flushed at exit if not asked)
+    sys.stdout.flush()
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        sys.stdout.write(payload.decode("utf-8"))
+        sys.stdout.flush()
+        return
+
+    buffer.write(payload)
+    if flush:
+        buffer.flush()
+
+
+def write_json(data: Any, pretty: Optional[bool] = None, flush: bool = True) -> None:
+    # Encode incrementally straight to stdout so large payloads never exist as
+    # one owned string. Indentation is only worth its cost for a human reader.
+    if pretty is None:
+        pretty = not _force_compact and stdout_is_tty()
 
-    return serialize(data)
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        write_stdout_bytes(orjson.dumps(data, option=option), flush=flush)
+        return
+
+    encoder = json.JSONEncoder(
+        ensure_ascii=False,
+        indent=2 if pretty else None,
+        separators=(",", ": ") if pretty else (",", ":")
+    )
+
+    write = sys.stdout.write
+    pending = []
+    pending_size = 0
+    for chunk in encoder.iterencode(data):
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= _WRITE_BLOCK_SIZE:
+            write("".join(pending))
+            pending.clear()
+            pending_size = 0
+
+    pending.append("\n")
+    write("".join(pending))
+    if flush:
+        sys.stdout.flush()
+
+
+def _dumps_compact(obj: Any) -> bytes:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class PartialOutputError(Exception):
+    # A streamed document failed after output started; it was closed with an
+    # "error" member so stdout still holds one valid document
+    pass
+
+
+_STREAM_END = object()
+
+
+def _peek(items):
+    # The first item is produced before anything is written, so an early
+    # failure still reaches the caller's error handler with stdout untouched
+    items = iter(items)
+    return next(items, _STREAM_END), items
+
+
+def write_json_stream(data: Dict[str, Any], key: str, flush: bool = True) -> None:
+    # data[key] is an iterable of items and must be the last member; the
+    # envelope goes out first, then one compact item at a time
+    item, items = _peek(data[key])
+    head = _dumps_compact({**data, key: []})
+    write_stdout_bytes(head[:-len(b"[]}")] + b"[", flush=flush)
+
+    separator = b""
+    try:
+        while item is not _STREAM_END:
+            write_stdout_bytes(separator + _dumps_compact(item), flush=flush)
+            separator = b","
+            item = next(items, _STREAM_END)
+    except Exception as e:
+        write_stdout_bytes(b'],"error":' + _dumps_compact(str(e)) + b"}\n", flush=flush)
+        raise PartialOutputError(str(e)) from e
+    write_stdout_bytes(b"]}\n", flush=flush)
+
+
+def write_clean_code_stream(data: Dict[str, Any], key: str, flush: bool = True) -> None:
+    # Same output as pretty_print_with_clean_code for a top-level list of
+    # dicts under data[key] (the last member), rendered item by item
+    item, items = _peek(data[key])
+    head = pretty_print_with_clean_code({**data, key: []})
+    write_stdout_bytes(head[:-len("[]\n}")].encode("utf-8"), flush=flush)
+
+    item_extra = "    "
+    opening = "[\n" + item_extra
+    wrote_items = False
+    try:
+        while item is not _STREAM_END:
+            out = [opening]
+            _emit_clean_code(item, 2, item_extra, out.append)
+            write_stdout_bytes("".join(out).encode("utf-8"), flush=flush)
+            opening = ",\n" + item_extra
+            wrote_items = True
+            item = next(items, _STREAM_END)
+    except Exception as e:
+        tail = "\n  ]" if wrote_items else "[]"
+        tail += f',\n  "error": {_encode_scalar(str(e))}\n}}\n'
+        write_stdout_bytes(tail.encode("utf-8"), flush=flush)
+        raise PartialOutputError(str(e)) from e
+
+    tail = "\n  ]\n}\n" if wrote_items else "[]\n}\n"
+    write_stdout_bytes(tail.encode("utf-8"), flush=flush)
 
 
 class CLIErrorHandler:
@@ -74,18 +228,39 @@ class CLIErrorHandler:
         logger.error(error_msg)
 
         if output_json:
-            print(json.dumps({
+            write_json({
                 "success": False,
                 "error": str(error),
                 "operation": operation.lower()
-            }, indent=2, ensure_ascii=False))
+            })
 
         sys.exit(1)
 
     @staticmethod
-    def handle_success(data: Dict[str, Any]) -> None:
+    def handle_success(data: Dict[str, Any], clean_code: bool = False) -> None:
         data["success"] = True
-        print(pretty_print_with_clean_code(data))
+        flush = stdout_is_tty()
+        if clean_code and not _force_compact:
+            output = pretty_print_with_clean_code(data) + "\n"
+            write_stdout_bytes(output.encode("utf-8"), flush=flush)
+        else:
+            write_json(data, flush=flush)
+
+    @staticmethod
+    def handle_success_stream(data: Dict[str, Any], key: str, clean_code: bool = False) -> None:
+        data["success"] = True
+        flush = stdout_is_tty()
+        try:
+            if clean_code and not _force_compact:
+                write_clean_code_stream(data, key, flush=flush)
+            elif _force_compact or not flush:
+                write_json_stream(data, key, flush=flush)
+            else:
+                data[key] = list(data[key])
+                write_json(data, flush=flush)
+        except PartialOutputError as e:
+            logger.error(f"Output failed after streaming started: {e}")
+            sys.exit(1)
 
 
 class CLIProjectPathResolver:
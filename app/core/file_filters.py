@@ -1,12 +1,51 @@
+import fnmatch
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import chain
 from pathlib import Path
-from typing import List, Set
+from typing import List, FrozenSet, Optional, Tuple
 from app.utils.config import AppConfig
 from app.indexer.parser import TreeSitterParser
 
+try:
+    from pathspec import GitIgnoreSpec
+    PATHSPEC_AVAILABLE = True
+except ImportError:
+    GitIgnoreSpec = None
+    PATHSPEC_AVAILABLE = False
 
-def get_all_supported_extensions() -> Set[str]:
-    parser = TreeSitterParser()
-    return parser.get_all_supported_extensions()
+_MAX_WALK_WORKERS = 8
+
+
+def get_all_supported_extensions() -> FrozenSet[str]:
+    return TreeSitterParser.get_all_supported_extensions()
+
+
+def _ignore_pattern_regex(pattern: str) -> str:
+    # gitignore-style: a name matches whole path components ("env" no longer
+    # hits "environment.py"), a leading "." entry matches a name suffix so
+    # extensions keep working, and * / ? never cross a separator
+    pattern = pattern.strip('/')
+    body = (
+        re.escape(pattern)
+        .replace('/', r'[\\/]')
+        .replace(r'\*', r'[^\\/]*')
+        .replace(r'\?', r'[^\\/]')
+    )
+    if pattern.startswith('.'):
+        return body + r'(?=[\\/]|$)'
+    return r'(?:^|[\\/])' + body + r'(?=[\\/]|$)'
+
+
+@lru_cache(maxsize=32)
+def _compile_ignore(patterns: Tuple[str, ...]) -> Optional[re.Pattern]:
+    # One alternation scans the path once instead of once per pattern
+    patterns = tuple(pattern for pattern in patterns if pattern.strip('/'))
+    if not patterns:
+        return None
+    return re.compile('|'.join(_ignore_pattern_regex(pattern) for pattern in patterns))
 
 
 def should_ignore(file_path: Path, ignore_patterns: List[str] = None, project_path: Path = None) -> bool:
@@ -17,41 +56,190 @@ def should_ignore(file_path: Path, ignore_patterns: List[str] = None, project_pa
         if part.startswith('.') and len(part) > 1:
             return True
 
+    if ignore_patterns is None:
+        ignore_patterns = AppConfig.DEFAULT_IGNORE_PATTERNS
+
+    _, ignore_regexes = _ignore_rules(
+        tuple(ignore_patterns),
+        str(project_path) if project_path else None
+    )
+
+    # Patterns apply below the project root, not to the directories above it
     if project_path:
-        ignore_config = AppConfig.get_ignore_config(str(project_path))
-        path_blacklist = ignore_config.get('path_blacklist', [])
+        root = os.path.join(str(project_path), '')
+        if path_str.startswith(root):
+            path_str = path_str[len(root):]
+    return any(regex.search(path_str) for regex in ignore_regexes)
 
-        for blacklisted_path in path_blacklist:
-            if blacklisted_path in path_str:
-                return True
 
-    if ignore_patterns is None:
-        ignore_patterns = AppConfig.DEFAULT_IGNORE_PATTERNS
+@lru_cache(maxsize=32)
+def _ignore_rules(
+    ignore_patterns: Tuple[str, ...],
+    project_path: Optional[str]
+) -> Tuple[FrozenSet[str], Tuple[re.Pattern, ...]]:
+    extension_blacklist = frozenset()
+    regexes = []
 
-    for pattern in ignore_patterns:
-        if pattern in path_str:
-            return True
+    if project_path:
+        ignore_config = AppConfig.get_ignore_config(project_path)
+        extension_blacklist = frozenset(ignore_config.get('extension_blacklist', []))
+        regexes.append(_compile_ignore(tuple(ignore_config.get('path_blacklist', []))))
+
+    regexes.append(_compile_ignore(ignore_patterns))
+    return extension_blacklist, tuple(regex for regex in regexes if regex is not None)
 
-    return False
+
+@lru_cache(maxsize=8)
+def _load_gitignore(gitignore_path: str, mtime_ns: int) -> Optional["GitIgnoreSpec"]:
+    try:
+        with open(gitignore_path, encoding='utf-8', errors='replace') as f:
+            return GitIgnoreSpec.from_lines(f)
+    except OSError:
+        return None
+
+
+def _gitignore_spec(project_path) -> Optional["GitIgnoreSpec"]:
+    # Keyed on mtime so long-running watchers pick up .gitignore edits
+    if not PATHSPEC_AVAILABLE or not project_path:
+        return None
+
+    gitignore_path = os.path.join(str(project_path), '.gitignore')
+    try:
+        mtime_ns = os.stat(gitignore_path).st_mtime_ns
+    except OSError:
+        return None
+    return _load_gitignore(gitignore_path, mtime_ns)
+
+
+def _filter_path_str(
+    path_str: str,
+    supported_exts: FrozenSet[str],
+    extension_blacklist: FrozenSet[str],
+    ignore_regexes: Tuple[re.Pattern, ...],
+    gitignore: Optional["GitIgnoreSpec"] = None,
+    root_len: int = 0
+) -> bool:
+    name_start = path_str.rfind(os.sep) + 1
+    dot = path_str.rfind('.', name_start)
+    if dot <= name_start:
+        return False
+
+    ext = path_str[dot:].lower()
+    if ext not in supported_exts or ext in extension_blacklist:
+        return False
+
+    # Ignore patterns apply below the project root: a project that itself
+    # lives under a "build" or "env" directory must still be indexed
+    rel_path = path_str[root_len:]
+    for regex in ignore_regexes:
+        if regex.search(rel_path):
+            return False
+
+    if gitignore is not None and gitignore.match_file(rel_path):
+        return False
+    return True
+
+
+def _scan_dir(
+    path: str,
+    supported_exts: FrozenSet[str],
+    extension_blacklist: FrozenSet[str],
+    ignore_regexes: Tuple[re.Pattern, ...],
+    gitignore: Optional["GitIgnoreSpec"] = None,
+    root_len: int = 0
+) -> Tuple[List[str], List[str]]:
+    # Ignore patterns match path components, so once a directory matches,
+    # every path below it matches too and the whole subtree can be skipped
+    files = []
+    dirs = []
+    try:
+        entries = os.scandir(path)
+    except OSError:
+        return files, dirs
+
+    with entries:
+        for entry in entries:
+            # Hidden entries are skipped for the indexer as well as auto-sync,
+            # so .github/, .venv/ and the like are never indexed
+            if entry.name.startswith('.'):
+                continue
+
+            entry_path = entry.path
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    rel_path = entry_path[root_len:]
+                    if any(regex.search(rel_path) for regex in ignore_regexes):
+                        continue
+                    if gitignore is not None and gitignore.match_file(rel_path + '/'):
+                        continue
+                    dirs.append(entry_path)
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+
+            if _filter_path_str(
+                entry_path, supported_exts, extension_blacklist, ignore_regexes, gitignore, root_len
+            ):
+                files.append(entry_path)
+
+    return files, dirs
+
+
+def _walk(
+    base: str,
+    supported_exts: FrozenSet[str],
+    extension_blacklist: FrozenSet[str],
+    ignore_regexes: Tuple[re.Pattern, ...],
+    gitignore: Optional["GitIgnoreSpec"] = None,
+    root_len: int = 0
+) -> List[str]:
+    found = []
+    stack = [base]
+    while stack:
+        files, dirs = _scan_dir(
+            stack.pop(), supported_exts, extension_blacklist, ignore_regexes, gitignore, root_len
+        )
+        found.extend(files)
+        stack.extend(dirs)
+    return found
 
 
 def find_files(
     base_path: Path,
     ignore_patterns: List[str] = None
 ) -> List[Path]:
-    files = []
-
     if ignore_patterns is None:
         ignore_patterns = AppConfig.DEFAULT_IGNORE_PATTERNS
 
-    for file_path in base_path.rglob('*'):
-        if not file_path.is_file():
-            continue
+    extension_blacklist, ignore_regexes = _ignore_rules(tuple(ignore_patterns), str(base_path))
+    supported_exts = get_all_supported_extensions()
+    gitignore = _gitignore_spec(base_path)
+    base = str(base_path)
+    root_len = len(os.path.join(base, ''))
+
+    # scandir releases the GIL, so top-level subtrees can be walked concurrently
+    files, dirs = _scan_dir(
+        base, supported_exts, extension_blacklist, ignore_regexes, gitignore, root_len
+    )
+    walk = partial(
+        _walk,
+        supported_exts=supported_exts,
+        extension_blacklist=extension_blacklist,
+        ignore_regexes=ignore_regexes,
+        gitignore=gitignore,
+        root_len=root_len
+    )
 
-        if should_process_file(file_path, ignore_patterns, base_path):
-            files.append(file_path)
+    if len(dirs) > 1:
+        max_workers = min(_MAX_WALK_WORKERS, len(dirs), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            subtrees = list(executor.map(walk, dirs))
+    else:
+        subtrees = [walk(path) for path in dirs]
 
-    return files
+    return [Path(path) for path in chain(files, chain.from_iterable(subtrees))]
 
 
 def should_process_file(
@@ -59,26 +247,57 @@ def should_process_file(
     ignore_patterns: List[str] = None,
     project_path: Path = None
 ) -> bool:
-    if project_path:
-        ignore_config = AppConfig.get_ignore_config(str(project_path))
-        extension_blacklist = ignore_config.get('extension_blacklist', [])
+    if ignore_patterns is None:
+        ignore_patterns = AppConfig.DEFAULT_IGNORE_PATTERNS
 
-        if file_path.suffix.lower() in extension_blacklist:
-            return False
+    extension_blacklist, ignore_regexes = _ignore_rules(
+        tuple(ignore_patterns),
+        str(project_path) if project_path else None
+    )
 
-    supported_exts = get_all_supported_extensions()
-    if file_path.suffix.lower() not in supported_exts:
-        return False
+    # .gitignore patterns and the dot-directory rule apply below the project root
+    path_str = str(file_path)
+    root_len = 0
+    gitignore = None
+    if project_path:
+        root = os.path.join(str(project_path), '')
+        if path_str.startswith(root):
+            root_len = len(root)
+            gitignore = _gitignore_spec(project_path)
+        elif not os.path.isabs(path_str):
+            gitignore = _gitignore_spec(project_path)
 
-    if should_ignore(file_path, ignore_patterns, project_path):
+    if not _filter_path_str(
+        path_str,
+        get_all_supported_extensions(),
+        extension_blacklist,
+        ignore_regexes,
+        gitignore,
+        root_len
+    ):
         return False
 
+    for part in Path(path_str[root_len:]).parts:
+        if part.startswith('.') and len(part) > 1:
+            return False
+
     return True
 
 
-def get_watch_patterns() -> List[str]:
-    supported_exts = get_all_supported_extensions()
-    return [f"*{ext}" for ext in supported_exts]
+@lru_cache(maxsize=1)
+def get_watch_patterns() -> Tuple[str, ...]:
+    # Shared across callers, so a tuple; sorted for a stable pattern order
+    return tuple(f"*{ext}" for ext in sorted(get_all_supported_extensions()))
+
+
+@lru_cache(maxsize=1)
+def get_watch_regex() -> re.Pattern:
+    # One compiled alternation instead of an fnmatch per pattern per event;
+    # case-insensitive like the watchdog handler
+    return re.compile(
+        '|'.join(fnmatch.translate(pattern) for pattern in get_watch_patterns()),
+        re.IGNORECASE
+    )
 
 
 def get_ignore_patterns(base_patterns: List[str] = None) -> List[str]:
@@ -89,7 +308,10 @@ def get_ignore_patterns(base_patterns: List[str] = None) -> List[str]:
     for pattern in base_patterns:
         if pattern.startswith('*.'):
             ignore.append(pattern)
+        elif pattern.startswith('.'):
+            ignore.append(f"*{pattern}")
+            ignore.append(f"*{pattern}/*")
         else:
+            ignore.append(f"*/{pattern}")
             ignore.append(f"*/{pattern}/*")
-            ignore.append(f"*{pattern}*")
     return ignore
@@ -1,3 +1,4 @@
+import os
 from typing import List, Optional, Tuple, Dict, Any
 from pathlib import Path
 from datetime import datetime
@@ -5,9 +6,9 @@ from dataclasses import dataclass
 
 from app.indexer.parser import TreeSitterParser
 from app.indexer.chunker import CodeChunker
+from app.core.parse_worker import read_and_chunk
 from app.indexer.embeddings import EmbeddingGenerator
 from app.search.vector_db import VectorDatabase
-from app.utils.config import AppConfig
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -42,38 +43,17 @@ class FileProcessor:
         delete_existing: bool = False
     ) -> ProcessedFileResult:
         try:
-            if include_file_stats:
-                file_stat = file_path.stat()
-                size_bytes = file_stat.st_size
-
-                if size_bytes > AppConfig.MAX_FILE_SIZE:
-                    size_mb = size_bytes / (1024 * 1024)
-                    return ProcessedFileResult(
-                        file_path=str(file_path),
-                        chunks_count=0,
-                        success=False,
-                        error=f"File too large: {size_mb:.1f}MB"
-                    )
-
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-
-            parse_result = self.parser.parse_file(str(file_path), content)
-            if not parse_result:
+            chunks, error = read_and_chunk(
+                self.parser, self.chunker, file_path, relative_path, include_file_stats
+            )
+            if error:
                 return ProcessedFileResult(
                     file_path=str(file_path),
                     chunks_count=0,
                     success=False,
-                    error="Parse failed"
+                    error=error
                 )
 
-            chunks = self.chunker.chunk_code(
-                content,
-                relative_path,
-                parse_result['language'],
-                parse_result.get('nodes')
-            )
-
             if not chunks:
                 if delete_existing:
                     self.vector_db.delete_by_file(relative_path)
@@ -119,12 +99,18 @@ class FileProcessor:
     ) -> Tuple[int, int]:
         total_chunks = 0
         processed_count = 0
+        root = os.path.join(str(project_path), '')
+        root_len = len(root)
 
         for idx, file_path in enumerate(files, 1):
             if callback_fn:
                 callback_fn(idx, len(files), file_path.name)
 
-            relative_path = str(file_path.relative_to(project_path))
+            path_str = str(file_path)
+            if path_str.startswith(root):
+                relative_path = path_str[root_len:]
+            else:
+                relative_path = str(file_path.relative_to(project_path))
             result = self.process_file(
                 file_path,
                 relative_path,
@@ -1,5 +1,6 @@
 from typing import Optional, Tuple, Dict, Any
 from dataclasses import dataclass
+from functools import lru_cache
 
 from app.utils.config import AppConfig
 from app.utils.logger import get_logger
@@ -19,6 +20,7 @@ class ModelValidationResult:
 class ModelValidator:
 
     @staticmethod
+    @lru_cache(maxsize=64)
     def _normalize_model_name(model_name: Optional[str]) -> Optional[str]:
         if not model_name:
             return None
@@ -0,0 +1,214 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Optional, Tuple, List, Iterator
+
+from app.indexer.parser import TreeSitterParser
+from app.indexer.chunker import CodeChunker
+from app.utils.config import AppConfig
+
+# Kept free of the embedding and LanceDB imports so spawned indexing workers
+# start quickly
+
+# Files per worker below which a process pool costs more than it saves
+_PARALLEL_MIN_FILES = 64
+
+# Files per pool task, and pool tasks in flight per worker. The pool only
+# runs this far ahead of the consumer, so parsed chunks for a whole project
+# never pile up in the parent while embedding catches up
+_POOL_TASK_FILES = 16
+_POOL_TASKS_PER_WORKER = 4
+
+_worker_parser: Optional[TreeSitterParser] = None
+_worker_chunker: Optional[CodeChunker] = None
+
+
+@dataclass
+class LoadedFile:
+    status: str  # "indexed", "skipped" or "failed"
+    chunks: Optional[list] = None
+    language: Optional[str] = None
+    error_type: Optional[str] = None
+    message: Optional[str] = None
+
+
+def _read_bytes(file_path, max_size: Optional[int] = None) -> Optional[bytes]:
+    # Raw fd reads sized from fstat: a typical source file is one read()
+    # with no FileIO/BufferedReader objects around it. Reading max_size + 1
+    # up front would allocate that much for every file
+    fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        size = os.fstat(fd).st_size + 1
+        if max_size is not None:
+            size = min(size, max_size + 1)
+
+        chunks = []
+        total = 0
+        while True:
+            data = os.read(fd, size)
+            chunks.append(data)
+            total += len(data)
+            if max_size is not None and total > max_size:
+                return None
+            # A short read means EOF; a file that grew since fstat loops
+            if len(data) < size:
+                break
+    finally:
+        os.close(fd)
+
+    return chunks[0] if len(chunks) == 1 else b''.join(chunks)
+
+
+def read_source_text(file_path, max_size: Optional[int] = None) -> Optional[str]:
+    # One read and one decode; same text as open(..., 'r', encoding='utf-8',
+    # errors='ignore') including its universal-newline translation.
+    # With max_size, reads at most max_size + 1 bytes and returns None if the
+    # file is larger, so oversized files are never fully loaded
+    raw = _read_bytes(file_path, max_size)
+    if raw is None:
+        return None
+
+    content = raw.decode('utf-8', 'ignore')
+    if b'\r' in raw:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def read_and_chunk(
+    parser: TreeSitterParser,
+    chunker: CodeChunker,
+    file_path: Path,
+    relative_path: str,
+    include_file_stats: bool = True
+) -> Tuple[Optional[list], Optional[str]]:
+    if include_file_stats:
+        file_stat = file_path.stat()
+        size_bytes = file_stat.st_size
+
+        if size_bytes > AppConfig.MAX_FILE_SIZE:
+            size_mb = size_bytes / (1024 * 1024)
+            return None, f"File too large: {size_mb:.1f}MB"
+
+        content = read_source_text(file_path)
+    else:
+        content = read_source_text(file_path, AppConfig.MAX_FILE_SIZE)
+        if content is None:
+            return None, "File too large"
+
+    parse_result = parser.parse_file(str(file_path), content)
+    if not parse_result:
+        return None, "Parse failed"
+
+    chunks = chunker.chunk_code(
+        content,
+        relative_path,
+        parse_result['language'],
+        parse_result.get('nodes')
+    )
+    return chunks, None
+
+
+def load_file(
+    parser: TreeSitterParser,
+    chunker: CodeChunker,
+    file_path: Path,
+    relative_path: str
+) -> LoadedFile:
+    # Everything the indexer does to a file before embedding it
+    try:
+        try:
+            content = read_source_text(file_path, AppConfig.MAX_FILE_SIZE)
+        except Exception as e:
+            return LoadedFile("failed", error_type="encoding_error", message=str(e))
+
+        if content is None:
+            size_mb = file_path.stat().st_size / (1024 * 1024)
+            return LoadedFile("skipped", message=f"file too large: {size_mb:.1f}MB")
+
+        parse_result = parser.parse_file(str(file_path), content)
+        if not parse_result:
+            return LoadedFile("failed", error_type="parse_error", message="Failed to parse file")
+
+        chunks = chunker.chunk_code(
+            content,
+            relative_path,
+            parse_result['language'],
+            parse_result.get('nodes')
+        )
+        if not chunks:
+            return LoadedFile("skipped")
+
+        file_imports = parse_result.get('imports', [])
+        imports_str = ','.join(file_imports) if file_imports else ''
+
+        for chunk in chunks:
+            chunk.imports = imports_str
+
+        chunks = [chunk for chunk in chunks if chunk.is_high_quality()]
+        if not chunks:
+            return LoadedFile("skipped")
+
+        return LoadedFile("indexed", chunks=chunks, language=parse_result['language'])
+
+    except PermissionError as e:
+        return LoadedFile("failed", error_type="permission_error", message=str(e))
+    except Exception as e:
+        return LoadedFile("failed", error_type="unknown", message=str(e))
+
+
+def init_worker(chunker: CodeChunker) -> None:
+    # Tree-sitter parsers can't be pickled, so each worker builds its own
+    global _worker_parser, _worker_chunker
+    _worker_parser = TreeSitterParser()
+    _worker_chunker = chunker
+
+
+def _load_file_batch(tasks: List[Tuple[Path, str]]) -> List[LoadedFile]:
+    return [
+        load_file(_worker_parser, _worker_chunker, file_path, relative_path)
+        for file_path, relative_path in tasks
+    ]
+
+
+def iter_loaded_files(chunker: CodeChunker, tasks: List[Tuple[Path, str]]) -> Iterator[LoadedFile]:
+    # Reading, parsing and chunking fan out to worker processes on large
+    # projects; results come back in file order so embedding stays in the
+    # calling process
+    workers = min(os.cpu_count() or 1, len(tasks) // _PARALLEL_MIN_FILES)
+    if workers > 1:
+        # spawn, not fork: forking after LanceDB has started its runtime
+        # can deadlock the child
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            initargs=(chunker,)
+        )
+        batches = (
+            tasks[start:start + _POOL_TASK_FILES]
+            for start in range(0, len(tasks), _POOL_TASK_FILES)
+        )
+        try:
+            pending = deque(
+                executor.submit(_load_file_batch, batch)
+                for batch in islice(batches, workers * _POOL_TASKS_PER_WORKER)
+            )
+            while pending:
+                loaded = pending.popleft().result()
+                # Refill before handing results out so workers stay busy
+                batch = next(batches, None)
+                if batch is not None:
+                    pending.append(executor.submit(_load_file_batch, batch))
+                yield from loaded
+        finally:
+            # A cancelled run must not wait for the files still queued
+            executor.shutdown(wait=True, cancel_futures=True)
+        return
+
+    parser = TreeSitterParser()
+    for file_path, relative_path in tasks:
+        yield load_file(parser, chunker, file_path, relative_path)
@@ -1,20 +1,52 @@
-from typing import Dict, Any, Tuple, List, Optional
+from typing import Dict, Any, Tuple, List, Optional, Iterator
 from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import lru_cache
 import json
+import re
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+_CONTEXT_PREFETCH_WORKERS = 8
+
+# Lines after which a cut would split a block header from its body
+_STRUCTURE_RE = re.compile(
+    r'^\s*(?:(?:def|class|async\s+def)\s+\w+'
+    r'|(?:if|for|while|try|with|elif|else)\s*.*:\s*$'
+    r'|@\w+)'
+)
 
 
 def format_content_with_line_numbers(content: str, start_line: int) -> str:
     if not content:
         return ""
 
-    lines = content.split('\n')
-    formatted_lines = []
+    return '\n'.join(
+        f"{line_num:>4}│ {line}"
+        for line_num, line in enumerate(content.split('\n'), start_line)
+    )
 
-    for i, line in enumerate(lines):
-        line_num = start_line + i
-        formatted_lines.append(f"{line_num:>4}│ {line}")
 
-    return '\n'.join(formatted_lines)
+# Chunks of the same symbol repeat these fields, so parses are cached; the
+# returned objects are shared and must not be mutated
+@lru_cache(maxsize=2048)
+def _loads_json_field(value: str) -> Any:
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            # The stdlib parser also takes NaN/Infinity; plain text falls through
+            pass
+
+    try:
+        return json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return value
 
 
 def _parse_json_field(value: str) -> Any:
@@ -22,17 +54,22 @@ def _parse_json_field(value: str) -> Any:
         return None
 
     try:
-        return json.loads(value)
-    except (json.JSONDecodeError, TypeError):
+        return _loads_json_field(value)
+    except TypeError:
+        # Unhashable, which json.loads would reject anyway
         return value
 
 
+@lru_cache(maxsize=1024)
+def _split_imports(imports_str: str) -> List[str]:
+    return [imp.strip() for imp in imports_str.split(',') if imp.strip()]
+
+
 def _parse_imports_string(imports_str: str) -> List[str]:
     if not imports_str or imports_str == "":
         return []
 
-    imports_list = [imp.strip() for imp in imports_str.split(',') if imp.strip()]
-    return imports_list
+    return _split_imports(imports_str)
 
 
 def add_truncation_indicator(content: str, total_lines: int, shown_lines: int) -> str:
@@ -40,28 +77,33 @@ def add_truncation_indicator(content: str, total_lines: int, shown_lines: int) -
     return content + indicator
 
 
-def detect_code_structure(lines: List[str], max_line_idx: int) -> int:
-    import re
+def _opens_block(line: str) -> bool:
+    return _STRUCTURE_RE.match(line) is not None
 
+
+def detect_code_structure(lines: List[str], max_line_idx: int) -> int:
     if max_line_idx >= len(lines):
         return max_line_idx
 
     last_line = lines[max_line_idx - 1].strip() if max_line_idx > 0 else ""
 
-    structure_patterns = [
-        r'^\s*(def|class|async\s+def)\s+\w+',
-        r'^\s*(if|for|while|try|with|elif|else)\s*.*:\s*$',
-        r'^\s*@\w+',
-    ]
-
-    for pattern in structure_patterns:
-        if re.match(pattern, last_line):
-            additional_lines = min(5, len(lines) - max_line_idx)
-            return max_line_idx + additional_lines
+    if _opens_block(last_line):
+        additional_lines = min(5, len(lines) - max_line_idx)
+        return max_line_idx + additional_lines
 
     return max_line_idx
 
 
+def _extend_line_ends(content: str, line_ends: List[int], count: int) -> None:
+    pos = line_ends[-1] + 1 if line_ends else 0
+    while len(line_ends) < count:
+        end = content.find('\n', pos)
+        if end < 0:
+            end = len(content)
+        line_ends.append(end)
+        pos = end + 1
+
+
 def smart_truncate_code(
     content: str,
     max_chars: int = 800,
@@ -71,34 +113,46 @@ def smart_truncate_code(
     if not content:
         return ("", False, 0, 0)
 
-    lines = content.split('\n')
-
-    if len(content) <= max_chars and len(lines) <= max_lines:
-        return (content, False, len(lines), len(lines))
+    total_lines = content.count('\n') + 1
 
-    truncate_at_line = min(max_lines, len(lines))
+    if len(content) <= max_chars and total_lines <= max_lines:
+        return (content, False, total_lines, total_lines)
 
-    accumulated_chars = 0
+    # Only the lines the cut can reach are scanned; the chunk is never split
+    # into a list. line_ends[i] is the offset of the newline ending line i
+    truncate_at_line = min(max_lines, total_lines)
+    line_ends = []
+    pos = 0
     for i in range(truncate_at_line):
-        accumulated_chars += len(lines[i]) + 1
-        if accumulated_chars > max_chars:
+        end = content.find('\n', pos)
+        if end < 0:
+            end = len(content)
+        if end + 1 > max_chars:
             truncate_at_line = max(1, i)
             break
+        line_ends.append(end)
+        pos = end + 1
 
-    if preserve_structure and truncate_at_line < len(lines):
-        truncate_at_line = detect_code_structure(lines, truncate_at_line)
+    _extend_line_ends(content, line_ends, truncate_at_line)
 
-    truncated_lines = lines[:truncate_at_line]
-    truncated_content = '\n'.join(truncated_lines)
+    if preserve_structure and 0 < truncate_at_line < total_lines:
+        last_start = line_ends[-2] + 1 if len(line_ends) > 1 else 0
+        if _opens_block(content[last_start:line_ends[-1]].strip()):
+            truncate_at_line += min(5, total_lines - truncate_at_line)
+            _extend_line_ends(content, line_ends, truncate_at_line)
 
-    is_truncated = truncate_at_line < len(lines)
-    return (truncated_content, is_truncated, truncate_at_line, len(lines))
+    truncated_content = content[:line_ends[-1]] if line_ends else ""
+
+    is_truncated = truncate_at_line < total_lines
+    return (truncated_content, is_truncated, truncate_at_line, total_lines)
 
 
 def _format_compact(
     result: Dict[str, Any],
     formatted_content: str,
-    score: float
+    score: float,
+    content_length: int = 0,
+    is_truncated: bool = False
 ) -> Dict[str, Any]:
     file_path = result.get("file_path", "")
     start_line = result.get("start_line", 0)
@@ -257,6 +311,13 @@ def _format_verbose(
     return verbose_result
 
 
+_FORMATTERS = {
+    "compact": _format_compact,
+    "standard": _format_standard,
+    "verbose": _format_verbose,
+}
+
+
 def calculate_score(result: Dict[str, Any], mode: str, rank: int = 1, total: int = 1) -> float:
     if mode == "hybrid":
         return result.get('rrf_score', 0.0)
@@ -269,6 +330,64 @@ def calculate_score(result: Dict[str, Any], mode: str, rank: int = 1, total: int
         return 0.0
 
 
+def calculate_scores(results: List[Dict[str, Any]], mode: str) -> List[float]:
+    total = len(results)
+
+    if mode == "hybrid":
+        return [r.get('rrf_score', 0.0) for r in results]
+    elif mode == "vector":
+        import numpy as np
+        distances = np.fromiter(
+            (r.get('_distance', 1.0) for r in results),
+            dtype=np.float64,
+            count=total
+        )
+        return (1.0 / (1.0 + distances)).tolist()
+    elif mode == "keyword":
+        import numpy as np
+        return (np.arange(total, 0, -1, dtype=np.float64) / max(total, 1)).tolist()
+    else:
+        return [0.0] * total
+
+
+@lru_cache(maxsize=64)
+def _read_file_lines(full_path: str) -> List[bytes]:
+    with open(full_path, 'rb') as f:
+        return f.read().splitlines()
+
+
+def clear_context_cache() -> None:
+    _read_file_lines.cache_clear()
+
+
+def _decode_lines(lines: List[bytes]) -> List[str]:
+    return [line.decode('utf-8', 'ignore').rstrip() for line in lines]
+
+
+@lru_cache(maxsize=8)
+def _project_base(project_path: str) -> Path:
+    return Path(project_path)
+
+
+def _prefetch_context_files(results: List[Dict[str, Any]], project_path: str) -> Dict[str, Future]:
+    # File reads release the GIL, so the distinct files of a page are read
+    # concurrently into the context cache while earlier results are formatted
+    file_paths = list(dict.fromkeys(r.get("file_path") for r in results if r.get("file_path")))
+    if len(file_paths) < 2:
+        return {}
+
+    # More than the cache holds would evict files before they are used
+    file_paths = file_paths[:_read_file_lines.cache_info().maxsize]
+    base = _project_base(project_path)
+    executor = ThreadPoolExecutor(max_workers=min(_CONTEXT_PREFETCH_WORKERS, len(file_paths)))
+    futures = {
+        file_path: executor.submit(_read_file_lines, str(base / file_path))
+        for file_path in file_paths
+    }
+    executor.shutdown(wait=False)
+    return futures
+
+
 def get_context_lines(
     file_path: str,
     start_line: int,
@@ -277,12 +396,7 @@ def get_context_lines(
     project_path: str
 ) -> Tuple[List[str], List[str]]:
     try:
-        full_path = Path(project_path) / file_path
-        if not full_path.exists():
-            return ([], [])
-
-        with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-            all_lines = f.readlines()
+        all_lines = _read_file_lines(str(_project_base(project_path) / file_path))
 
         context_start = max(0, start_line - context)
         lines_before = all_lines[context_start:start_line]
@@ -290,14 +404,34 @@ def get_context_lines(
         context_end = min(len(all_lines), end_line + 1 + context)
         lines_after = all_lines[end_line + 1:context_end]
 
-        return (
-            [line.rstrip() for line in lines_before],
-            [line.rstrip() for line in lines_after]
-        )
+        return (_decode_lines(lines_before), _decode_lines(lines_after))
     except Exception:
         return ([], [])
 
 
+def _build_context_block(
+    result: Dict[str, Any],
+    context: int,
+    project_path: str
+) -> Dict[str, Any]:
+    start_line = result.get("start_line")
+    end_line = result.get("end_line")
+    lines_before, lines_after = get_context_lines(
+        result.get("file_path"),
+        start_line,
+        end_line,
+        context,
+        project_path
+    )
+
+    return {
+        "lines_before": lines_before,
+        "lines_after": lines_after,
+        "range_before": f"{max(0, start_line - context)}-{start_line - 1}",
+        "range_after": f"{end_line + 1}-{end_line + context}"
+    }
+
+
 def process_cli_results(
     results: List[Dict[str, Any]],
     mode: str,
@@ -310,10 +444,40 @@ def process_cli_results(
     output_format: str = "compact",
     smart_truncate: bool = True
 ) -> List[Dict[str, Any]]:
-    processed_results = []
+    return list(iter_cli_results(
+        results,
+        mode,
+        project_path,
+        context=context,
+        preview_length=preview_length,
+        preview_lines=preview_lines,
+        full_content=full_content,
+        max_content_length=max_content_length,
+        output_format=output_format,
+        smart_truncate=smart_truncate
+    ))
+
+
+def iter_cli_results(
+    results: List[Dict[str, Any]],
+    mode: str,
+    project_path: str,
+    context: int = 0,
+    preview_length: int = 800,
+    preview_lines: int = 20,
+    full_content: bool = False,
+    max_content_length: int = 10000,
+    output_format: str = "compact",
+    smart_truncate: bool = True
+) -> Iterator[Dict[str, Any]]:
+    content_limit = max_content_length if full_content else preview_length
+    scores = calculate_scores(results, mode)
+    formatter = _FORMATTERS.get(output_format, _format_verbose)
+    prefetched = _prefetch_context_files(results, project_path) if context > 0 else {}
 
     for idx, r in enumerate(results):
-        raw_content = r.get("content", "")
+        raw_content = r.get("content") or ""
+        content_length = len(raw_content)
 
         if smart_truncate and not full_content:
             truncated_content, is_truncated, shown_lines, total_lines = smart_truncate_code(
@@ -323,8 +487,8 @@ def process_cli_results(
                 preserve_structure=True
             )
         else:
-            truncated_content = raw_content[:max_content_length] if full_content else raw_content[:preview_length]
-            is_truncated = len(raw_content) > (max_content_length if full_content else preview_length)
+            truncated_content = raw_content[:content_limit]
+            is_truncated = content_length > content_limit
             shown_lines = 0
             total_lines = 0
 
@@ -333,34 +497,18 @@ def process_cli_results(
         if is_truncated and shown_lines > 0:
             formatted_content = add_truncation_indicator(formatted_content, total_lines, shown_lines)
 
-        content_length = len(raw_content)
-        score = calculate_score(r, mode, idx + 1, len(results))
+        score = scores[idx]
 
-        if output_format == "compact":
-            result_dict = _format_compact(r, formatted_content, score)
-        elif output_format == "standard":
-            result_dict = _format_standard(r, formatted_content, score, content_length, is_truncated)
-        else:
-            result_dict = _format_verbose(r, formatted_content, score, content_length, is_truncated)
+        result_dict = formatter(r, formatted_content, score, content_length, is_truncated)
 
         if context > 0:
-            lines_before, lines_after = get_context_lines(
-                r.get("file_path"),
-                r.get("start_line"),
-                r.get("end_line"),
-                context,
-                project_path
-            )
-            result_dict["context"] = {
-                "lines_before": lines_before,
-                "lines_after": lines_after,
-                "range_before": f"{max(0, r.get('start_line') - context)}-{r.get('start_line') - 1}",
-                "range_after": f"{r.get('end_line') + 1}-{r.get('end_line') + context}"
-            }
+            # Wait for an in-flight read so the file isn't read a second time
+            pending = prefetched.pop(r.get("file_path"), None)
+            if pending is not None:
+                wait([pending])
+            result_dict["context"] = _build_context_block(r, context, project_path)
 
-        processed_results.append(result_dict)
-
-    return processed_results
+        yield result_dict
 
 
 def add_context_to_result(
@@ -371,19 +519,6 @@ def add_context_to_result(
     if context <= 0:
         return result
 
-    lines_before, lines_after = get_context_lines(
-        result.get("file_path"),
-        result.get("start_line"),
-        result.get("end_line"),
-        context,
-        project_path
-    )
-
-    result["context"] = {
-        "lines_before": lines_before,
-        "lines_after": lines_after,
-        "range_before": f"{max(0, result.get('start_line') - context)}-{result.get('start_line') - 1}",
-        "range_after": f"{result.get('end_line') + 1}-{result.get('end_line') + context}"
-    }
+    result["context"] = _build_context_block(result, context, project_path)
 
     return result
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Iterator
+
+import numpy as np
+
+from app.utils.config import AppConfig
+from app.utils.logger import get_logger
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+
+def _dumps(results: List[Dict[str, Any]]) -> bytes:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(results, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(results, ensure_ascii=False, default=float).encode("utf-8")
+
+
+def _loads(payload: bytes) -> List[Dict[str, Any]]:
+    return orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(payload)
+
+
+class SearchCache:
+    """
+    Per-project search result cache in SQLite, next to the index.
+
+    Entries are tagged with the index version they were computed against, so
+    a reindex or auto-sync write makes them stale.
+    """
+
+    def __init__(self, project_path: str):
+        self.project_path = project_path
+        self.project_dir = AppConfig.get_project_dir(project_path)
+        self.db_file = self.project_dir / "search_cache.sqlite"
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(str(self.db_file), timeout=5.0)
+        try:
+            with conn:
+                if not self._initialized:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS queries ("
+                        "key TEXT PRIMARY KEY, scope TEXT NOT NULL, index_version TEXT NOT NULL, "
+                        "embedding BLOB, result BLOB NOT NULL, ts REAL NOT NULL)"
+                    )
+                    conn.execute(
+                        "CREATE INDEX IF NOT EXISTS queries_scope ON queries (scope, index_version)"
+                    )
+                    self._initialized = True
+                yield conn
+        finally:
+            conn.close()
+
+    def index_version(self) -> Optional[str]:
+        # Every LanceDB commit writes a new manifest into _versions, which bumps
+        # the directory mtime; indexed_at covers full re-indexes
+        versions_dir = (
+            AppConfig.get_project_data_dir(self.project_path)
+            / f"{AppConfig.DB_TABLE_NAME}.lance"
+            / "_versions"
+        )
+        try:
+            mtime_ns = os.stat(versions_dir).st_mtime_ns
+        except OSError:
+            return None
+
+        metadata = AppConfig.load_project_metadata(self.project_path)
+        return f"{metadata.get('indexed_at')}:{mtime_ns}"
+
+    @staticmethod
+    def make_scope(mode: str, limit: int, language: Optional[str]) -> str:
+        rerank = (
+            f"{AppConfig.RERANK_MODEL}:{AppConfig.RERANK_TOP_K}" if AppConfig.RERANK_ENABLED else "off"
+        )
+        return f"{mode}|{limit}|{language or ''}|{AppConfig.get_embedding_model()}|{rerank}"
+
+    @staticmethod
+    def make_key(scope: str, query: str) -> str:
+        return hashlib.blake2b(f"{scope}|{query}".encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str, index_version: str) -> Optional[List[Dict[str, Any]]]:
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT result FROM queries WHERE key = ? AND index_version = ?",
+                    (key, index_version)
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE queries SET ts = ? WHERE key = ?", (time.time(), key))
+            return _loads(row[0])
+        except Exception as e:
+            logger.debug(f"Search cache lookup failed: {e}")
+            return None
+
+    def find_similar(
+        self,
+        scope: str,
+        index_version: str,
+        embedding: np.ndarray,
+        threshold: float
+    ) -> Optional[List[Dict[str, Any]]]:
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT key, embedding FROM queries "
+                    "WHERE scope = ? AND index_version = ? AND embedding IS NOT NULL",
+                    (scope, index_version)
+                ).fetchall()
+
+                query = np.asarray(embedding, dtype=np.float32)
+                candidates = [(key, blob) for key, blob in rows if len(blob) == query.nbytes]
+                if not candidates:
+                    return None
+
+                # Stored and query embeddings are unit-norm, so dot == cosine
+                matrix = np.frombuffer(b"".join(blob for _, blob in candidates), dtype=np.float32)
+                similarities = matrix.reshape(len(candidates), -1) @ query
+                best = int(np.argmax(similarities))
+                if similarities[best] < threshold:
+                    return None
+
+                key = candidates[best][0]
+                row = conn.execute("SELECT result FROM queries WHERE key = ?", (key,)).fetchone()
+                conn.execute("UPDATE queries SET ts = ? WHERE key = ?", (time.time(), key))
+
+            logger.debug(f"Search cache semantic hit (similarity {similarities[best]:.3f})")
+            return _loads(row[0]) if row else None
+        except Exception as e:
+            logger.debug(f"Search cache similarity lookup failed: {e}")
+            return None
+
+    def put(
+        self,
+        key: str,
+        scope: str,
+        index_version: str,
+        results: List[Dict[str, Any]],
+        embedding: Optional[np.ndarray] = None
+    ) -> None:
+        results = [{k: v for k, v in result.items() if k != "vector"} for result in results]
+        embedding_blob = None
+        if embedding is not None:
+            embedding_blob = np.asarray(embedding, dtype=np.float32).tobytes()
+
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO queries (key, scope, index_version, embedding, result, ts) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, scope, index_version, embedding_blob, _dumps(results), time.time())
+                )
+                conn.execute("DELETE FROM queries WHERE index_version != ?", (index_version,))
+                conn.execute(
+                    "DELETE FROM queries WHERE key NOT IN "
+                    "(SELECT key FROM queries ORDER BY ts DESC LIMIT ?)",
+                    (AppConfig.SEARCH_CACHE_MAX_ENTRIES,)
+                )
+        except Exception as e:
+            logger.debug(f"Search cache store failed: {e}")
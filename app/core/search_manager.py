@@ -1,5 +1,4 @@
 from typing import Optional, List, Dict, Any, Tuple
-from dataclasses import dataclass
 
 from app.search.vector_db import VectorDatabase
 from app.search.hybrid import HybridSearch
@@ -7,19 +6,14 @@ from app.indexer.embeddings import EmbeddingGenerator
 from app.core.model_validator import ModelValidator, ModelValidationResult
 from app.core.project_context import ProjectContextManager
 from app.core.search_factory import create_search_engine
+from app.core.search_cache import SearchCache
+from app.core.search_result import SearchResult
+from app.utils.config import AppConfig
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
-@dataclass
-class SearchResult:
-    results: List[Dict[str, Any]]
-    validation: ModelValidationResult
-    total_results: int
-    execution_time_ms: float
-
-
 class SearchManager:
 
     def __init__(self, project_path: Optional[str] = None):
@@ -33,10 +27,14 @@ class SearchManager:
         self._vector_db: Optional[VectorDatabase] = None
         self._hybrid_search: Optional[HybridSearch] = None
         self._embedding_gen: Optional[EmbeddingGenerator] = None
+        self._search_cache: Optional[SearchCache] = None
+        # Index version the table handle was opened at
+        self._index_version: Optional[str] = None
 
     def initialize_search(self) -> Tuple[VectorDatabase, HybridSearch, EmbeddingGenerator]:
         if self._vector_db is None:
             logger.info(f"Initializing search engine for: {self.project_path}")
+            self._index_version = SearchCache(self.project_path).index_version()
             self._vector_db, self._hybrid_search, self._embedding_gen = create_search_engine(
                 self.project_path
             )
@@ -45,6 +43,22 @@ class SearchManager:
 
         return self._vector_db, self._hybrid_search, self._embedding_gen
 
+    def refresh_index(self) -> None:
+        # A table handle only sees the version it was opened at, and a reindex
+        # recreates the project dir underneath it, so long-lived managers (the
+        # search daemon) reopen the table whenever the index has changed
+        if self._vector_db is None:
+            return
+
+        index_version = SearchCache(self.project_path).index_version()
+        if index_version == self._index_version:
+            return
+
+        logger.info(f"Index changed, reopening table for: {self.project_path}")
+        self._index_version = index_version
+        self._vector_db = VectorDatabase(project_path=self.project_path)
+        self._hybrid_search.vector_db = self._vector_db
+
     def validate_models(self) -> ModelValidationResult:
         return ModelValidator.validate_search_models(self.project_path)
 
@@ -53,40 +67,58 @@ class SearchManager:
         query: str,
         mode: str = "hybrid",
         limit: int = 10,
-        validate_model: bool = True
+        validate_model: bool = True,
+        language: Optional[str] = None
     ) -> SearchResult:
         import time
 
         if not query or not query.strip():
             raise ValueError("Search query cannot be empty")
 
-        if limit <= 0:
-            raise ValueError("Limit must be positive")
-
-        if mode not in ["hybrid", "vector", "keyword"]:
-            raise ValueError(f"Invalid search mode: {mode}")
+        self._validate_search_args(mode, limit)
 
         try:
-            search_start = time.time()
+            search_start = time.perf_counter_ns()
 
-            validation_result = None
-            if validate_model:
-                validation_result = self.validate_models()
+            validation_result = self._run_model_validation(validate_model)
 
-                if validation_result.has_mismatch:
-                    logger.warning(validation_result.warning_message)
+            cache = self._get_search_cache()
+            index_version = cache.index_version() if cache else None
+            if index_version:
+                scope = SearchCache.make_scope(mode, limit, language)
+                cache_key = SearchCache.make_key(scope, query)
+
+                cached = cache.get(cache_key, index_version)
+                if cached is not None:
+                    return self._cached_search_result(cached, validation_result, search_start)
 
             _, hybrid_search, _ = self.initialize_search()
 
-            exec_start = time.time()
+            exec_start = time.perf_counter_ns()
+
+            query_embedding = None
+            if index_version and mode != "keyword" and AppConfig.SEARCH_CACHE_SEMANTIC:
+                query_embedding = hybrid_search.embed_queries([query])[0]
+                cached = cache.find_similar(
+                    scope, index_version, query_embedding, AppConfig.SEARCH_CACHE_SIMILARITY
+                )
+                if cached is not None:
+                    return self._cached_search_result(cached, validation_result, search_start)
+
             results = hybrid_search.search(
                 query=query,
                 mode=mode,
-                limit=limit
+                limit=limit,
+                language=language,
+                query_embedding=query_embedding
             )
-            exec_time = (time.time() - exec_start) * 1000
+            exec_time = (time.perf_counter_ns() - exec_start) / 1e6
 
-            total_time = (time.time() - search_start) * 1000
+            # A long-lived manager may have searched an older table version
+            if index_version and index_version == self._index_version:
+                cache.put(cache_key, scope, index_version, results, query_embedding)
+
+            total_time = (time.perf_counter_ns() - search_start) / 1e6
 
             logger.info(
                 f"Search completed: {len(results)} results in {total_time:.2f}ms "
@@ -104,8 +136,107 @@ class SearchManager:
             logger.error(f"Search failed: {str(e)}")
             raise RuntimeError(f"Search execution failed: {str(e)}") from e
 
+    def execute_search_batch(
+        self,
+        queries: List[str],
+        mode: str = "hybrid",
+        limit: int = 10,
+        validate_model: bool = True,
+        language: Optional[str] = None
+    ) -> List[SearchResult]:
+        import time
+
+        queries = [query for query in queries if query and query.strip()]
+        if not queries:
+            raise ValueError("Search queries cannot be empty")
+
+        self._validate_search_args(mode, limit)
+
+        try:
+            batch_start = time.perf_counter_ns()
+
+            validation_result = self._run_model_validation(validate_model)
+
+            _, hybrid_search, _ = self.initialize_search()
+
+            query_embeddings = [None] * len(queries)
+            if mode != "keyword":
+                query_embeddings = hybrid_search.embed_queries(queries)
+
+            search_results = []
+            for query, query_embedding in zip(queries, query_embeddings):
+                exec_start = time.perf_counter_ns()
+                results = hybrid_search.search(
+                    query=query,
+                    mode=mode,
+                    limit=limit,
+                    language=language,
+                    query_embedding=query_embedding
+                )
+                exec_time = (time.perf_counter_ns() - exec_start) / 1e6
+
+                search_results.append(SearchResult(
+                    results=results,
+                    validation=validation_result,
+                    total_results=len(results),
+                    execution_time_ms=exec_time
+                ))
+
+            total_time = (time.perf_counter_ns() - batch_start) / 1e6
+            logger.info(f"Batch search completed: {len(queries)} queries in {total_time:.2f}ms")
+
+            return search_results
+
+        except Exception as e:
+            logger.error(f"Batch search failed: {str(e)}")
+            raise RuntimeError(f"Batch search execution failed: {str(e)}") from e
+
+    def _get_search_cache(self) -> Optional[SearchCache]:
+        if not AppConfig.SEARCH_CACHE_ENABLED:
+            return None
+
+        if self._search_cache is None:
+            self._search_cache = SearchCache(self.project_path)
+        return self._search_cache
+
+    @staticmethod
+    def _cached_search_result(
+        results: List[Dict[str, Any]],
+        validation_result: Optional[ModelValidationResult],
+        search_start: int
+    ) -> SearchResult:
+        import time
+
+        exec_time = (time.perf_counter_ns() - search_start) / 1e6
+        logger.info(f"Search served from cache: {len(results)} results in {exec_time:.2f}ms")
+
+        return SearchResult(
+            results=results,
+            validation=validation_result,
+            total_results=len(results),
+            execution_time_ms=exec_time
+        )
+
+    @staticmethod
+    def _validate_search_args(mode: str, limit: int) -> None:
+        if limit <= 0:
+            raise ValueError("Limit must be positive")
+
+        if mode not in ["hybrid", "vector", "keyword"]:
+            raise ValueError(f"Invalid search mode: {mode}")
+
+    def _run_model_validation(self, validate_model: bool) -> Optional[ModelValidationResult]:
+        if not validate_model:
+            return None
+
+        validation_result = self.validate_models()
+        if validation_result.has_mismatch:
+            logger.warning(validation_result.warning_message)
+        return validation_result
+
     def clear_cache(self) -> None:
         self._vector_db = None
         self._hybrid_search = None
         self._embedding_gen = None
+        self._index_version = None
         logger.info("Search engine cache cleared")
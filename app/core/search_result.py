@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import List, Dict, Any
+
+from app.core.model_validator import ModelValidationResult
+
+# Kept free of the search stack: the search daemon client builds these without
+# importing LanceDB
+
+
+@dataclass
+class SearchResult:
+    results: List[Dict[str, Any]]
+    validation: ModelValidationResult
+    total_results: int
+    execution_time_ms: float
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
 from pathlib import Path
 from datetime import datetime
@@ -10,10 +11,14 @@ from app.utils.project_manager import ProjectManager
 class StatsManager:
 
     @staticmethod
-    def get_database_stats(project_path: Optional[str] = None) -> Dict[str, Any]:
+    def _resolve_project_path(project_path: Optional[str]) -> Optional[str]:
         if project_path is None:
-            project_manager = ProjectManager()
-            project_path = project_manager.get_current_project_path()
+            project_path = ProjectManager().get_current_project_path()
+        return project_path
+
+    @staticmethod
+    def get_database_stats(project_path: Optional[str] = None) -> Dict[str, Any]:
+        project_path = StatsManager._resolve_project_path(project_path)
 
         vector_db = VectorDatabase(project_path=project_path)
         db_stats = vector_db.get_stats()
@@ -26,25 +31,21 @@ class StatsManager:
 
     @staticmethod
     def get_language_breakdown(project_path: Optional[str] = None) -> Dict[str, int]:
-        if project_path is None:
-            project_manager = ProjectManager()
-            project_path = project_manager.get_current_project_path()
+        project_path = StatsManager._resolve_project_path(project_path)
 
         vector_db = VectorDatabase(project_path=project_path)
         return vector_db.get_language_breakdown()
 
     @staticmethod
     def get_advanced_stats(project_path: Optional[str] = None) -> Dict[str, Any]:
-        if project_path is None:
-            project_manager = ProjectManager()
-            project_path = project_manager.get_current_project_path()
+        project_path = StatsManager._resolve_project_path(project_path)
 
         vector_db = VectorDatabase(project_path=project_path)
-        language_breakdown = vector_db.get_language_breakdown()
-        chunk_type_breakdown = vector_db.get_chunk_type_breakdown()
+        table_stats = vector_db.get_all_stats()
+        language_breakdown = table_stats['language_breakdown']
+        chunk_type_breakdown = table_stats['chunk_type_breakdown']
         db_size_mb = vector_db.get_database_size_mb()
-        db_stats = vector_db.get_stats()
-        total_chunks = db_stats.get('count', 0)
+        total_chunks = table_stats['count']
 
         total_files = sum(language_breakdown.values()) if language_breakdown else 0
         avg_chunks_per_file = (total_chunks / total_files) if total_files > 0 else 0
@@ -60,11 +61,10 @@ class StatsManager:
 
     @staticmethod
     def get_project_stats(project_path: Optional[str] = None) -> Dict[str, Any]:
+        project_manager = ProjectManager()
         if project_path is None:
-            project_manager = ProjectManager()
             project_path = project_manager.get_current_project_path()
 
-        project_manager = ProjectManager()
         stats = project_manager.get_project_stats(project_path)
 
         return {
@@ -76,9 +76,7 @@ class StatsManager:
 
     @staticmethod
     def get_model_info(project_path: Optional[str] = None) -> Dict[str, Any]:
-        if project_path is None:
-            project_manager = ProjectManager()
-            project_path = project_manager.get_current_project_path()
+        project_path = StatsManager._resolve_project_path(project_path)
 
         metadata = AppConfig.load_project_metadata(project_path)
         current_model = AppConfig.get_embedding_model()
@@ -91,12 +89,16 @@ class StatsManager:
 
     @staticmethod
     def get_full_stats(project_path: Optional[str] = None) -> Dict[str, Any]:
-        if project_path is None:
-            project_manager = ProjectManager()
-            project_path = project_manager.get_current_project_path()
+        project_path = StatsManager._resolve_project_path(project_path)
+
+        # Independent reads (registry, LanceDB table, metadata), so they overlap
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            project = executor.submit(StatsManager.get_project_stats, project_path)
+            database = executor.submit(StatsManager.get_database_stats, project_path)
+            model = executor.submit(StatsManager.get_model_info, project_path)
 
         return {
-            'project': StatsManager.get_project_stats(project_path),
-            'database': StatsManager.get_database_stats(project_path),
-            'model': StatsManager.get_model_info(project_path)
+            'project': project.result(),
+            'database': database.result(),
+            'model': model.result()
         }
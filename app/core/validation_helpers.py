@@ -1,5 +1,7 @@
-from typing import List, Optional
-from pathlib import Path
+import os
+import stat
+from typing import FrozenSet, List, Optional
+from functools import lru_cache
 
 from app.utils.config import AppConfig
 from app.utils.logger import get_logger
@@ -8,18 +10,23 @@ logger = get_logger(__name__)
 
 
 class ValidationHelpers:
+    _SEARCH_MODES = ("hybrid", "vector", "keyword")
 
     @staticmethod
     def validate_project_path(path: str, raise_error: bool = True) -> bool:
         try:
-            path_obj = Path(path)
+            # One stat answers both checks
+            try:
+                path_stat = os.stat(path)
+            except (FileNotFoundError, NotADirectoryError):
+                path_stat = None
 
-            if not path_obj.exists():
+            if path_stat is None:
                 if raise_error:
                     raise ValueError(f"Project path does not exist: {path}")
                 return False
 
-            if not path_obj.is_dir():
+            if not stat.S_ISDIR(path_stat.st_mode):
                 if raise_error:
                     raise ValueError(f"Project path is not a directory: {path}")
                 return False
@@ -43,10 +50,11 @@ class ValidationHelpers:
                 raise ValueError("Search query cannot be empty")
             return False
 
-        valid_modes = ["hybrid", "vector", "keyword"]
-        if mode not in valid_modes:
+        if mode not in ValidationHelpers._SEARCH_MODES:
             if raise_error:
-                raise ValueError(f"Invalid search mode: {mode}. Must be one of {valid_modes}")
+                raise ValueError(
+                    f"Invalid search mode: {mode}. Must be one of {list(ValidationHelpers._SEARCH_MODES)}"
+                )
             return False
 
         if limit <= 0:
@@ -61,6 +69,11 @@ class ValidationHelpers:
 
         return True
 
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _full_model_names() -> FrozenSet[str]:
+        return frozenset(info['full_name'] for info in AppConfig.AVAILABLE_EMBEDDING_MODELS.values())
+
     @staticmethod
     def validate_embedding_model(model_name: str, raise_error: bool = True) -> bool:
         if not model_name:
@@ -71,9 +84,8 @@ class ValidationHelpers:
         if model_name in AppConfig.AVAILABLE_EMBEDDING_MODELS:
             return True
 
-        for key, info in AppConfig.AVAILABLE_EMBEDDING_MODELS.items():
-            if model_name == info['full_name']:
-                return True
+        if model_name in ValidationHelpers._full_model_names():
+            return True
 
         logger.warning(f"Using custom embedding model: {model_name}")
         return True
@@ -1,7 +1,6 @@
 from pathlib import Path
 from typing import Dict, Optional, Callable, List
 from datetime import datetime, timedelta
-import time
 import traceback
 import threading
 
@@ -13,6 +12,10 @@ from app.indexer.chunker import CodeChunker
 from app.indexer.embeddings import EmbeddingGenerator
 from app.search.vector_db import VectorDatabase
 from app.utils.config import AppConfig
+from app.core.file_filters import (
+    get_ignore_patterns, get_watch_patterns, get_watch_regex, should_process_file
+)
+from app.core.parse_worker import read_source_text
 
 
 class ChangeEvent:
@@ -58,11 +61,13 @@ class AutoSyncWorker(threading.Thread):
         on_sync_started: Optional[Callable[[int], None]] = None,
         on_sync_complete: Optional[Callable[[List[str], int], None]] = None,
         on_sync_error: Optional[Callable[[str, str], None]] = None,
-        on_health_status: Optional[Callable[[dict], None]] = None
+        on_health_status: Optional[Callable[[dict], None]] = None,
+        on_stopped: Optional[Callable[[], None]] = None
     ):
         super().__init__(daemon=True)
         self.project_path = Path(project_path)
         self._is_running = False
+        self._stop_event = threading.Event()
         self.observer = None
 
         self.on_file_changed = on_file_changed
@@ -70,6 +75,7 @@ class AutoSyncWorker(threading.Thread):
         self.on_sync_complete = on_sync_complete
         self.on_sync_error = on_sync_error
         self.on_health_status = on_health_status
+        self.on_stopped = on_stopped
 
         self.pending_changes: Dict[str, tuple] = {}
         self._pending_lock = threading.Lock()
@@ -92,7 +98,7 @@ class AutoSyncWorker(threading.Thread):
             self.parser = TreeSitterParser()
             self.chunker = CodeChunker()
             self.embedding_gen = EmbeddingGenerator()
-            self.vector_db = VectorDatabase()
+            self.vector_db = VectorDatabase(project_path=str(self.project_path))
 
             patterns = self._get_watch_patterns()
             ignore_patterns = self._get_ignore_patterns()
@@ -111,8 +117,7 @@ class AutoSyncWorker(threading.Thread):
             )
             self.observer.start()
 
-            while self._is_running:
-                time.sleep(0.5)
+            while not self._stop_event.wait(0.5):
                 self._process_pending_changes()
 
             if self.observer:
@@ -123,9 +128,14 @@ class AutoSyncWorker(threading.Thread):
             error_msg = f"Auto-sync failed: {str(e)}"
             if self.on_sync_error:
                 self.on_sync_error("system", error_msg)
+        finally:
+            self._is_running = False
+            if self.on_stopped:
+                self.on_stopped()
 
     def stop(self):
         self._is_running = False
+        self._stop_event.set()
 
     def _on_file_change(self, file_path: str, change_type: str):
         try:
@@ -165,26 +175,37 @@ class AutoSyncWorker(threading.Thread):
             self.on_sync_started(len(batch))
 
         total_chunks = 0
-        success_count = 0
         error_count = 0
         batch_files = []
+        loaded = []
 
         for file_path, change_type in batch:
             try:
-                chunks_updated = self._update_file(file_path, change_type)
-                total_chunks += chunks_updated
-                success_count += 1
-                batch_files.append(file_path)
-
-                with self._pending_lock:
-                    self.pending_changes.pop(file_path, None)
+                loaded.append((file_path, self._load_file(file_path, change_type)))
             except Exception as e:
-                error_msg = str(e)
                 error_count += 1
                 if self.on_sync_error:
-                    self.on_sync_error(file_path, error_msg)
-                with self._pending_lock:
-                    self.pending_changes.pop(file_path, None)
+                    self.on_sync_error(file_path, str(e))
+
+        # The whole batch is written together: one embedding call, one
+        # delete of the old rows and one add
+        try:
+            total_chunks = self._store_batch(loaded)
+            batch_files = [file_path for file_path, _ in loaded]
+        except Exception as e:
+            error_count += len(loaded)
+            if self.on_sync_error:
+                for file_path, _ in loaded:
+                    self.on_sync_error(file_path, str(e))
+
+        with self._pending_lock:
+            for file_path, _ in batch:
+                self.pending_changes.pop(file_path, None)
+
+        success_count = len(batch_files)
+
+        if success_count:
+            self._refresh_ann_index()
 
         self.last_sync_time = datetime.now()
         self.total_files_synced += success_count
@@ -195,6 +216,16 @@ class AutoSyncWorker(threading.Thread):
         if self.on_sync_complete and batch_files:
             self.on_sync_complete(batch_files, total_chunks)
 
+    def _refresh_ann_index(self):
+        project_path = str(self.project_path)
+        metadata = AppConfig.load_project_metadata(project_path)
+        indexed_rows = metadata.get("ann_index_rows", 0)
+
+        ann_index_rows = self.vector_db.ensure_ann_index(indexed_rows)
+        if ann_index_rows != indexed_rows:
+            metadata["ann_index_rows"] = ann_index_rows
+            AppConfig.save_project_metadata(project_path, metadata)
+
     def _emit_health_status(self):
         with self._pending_lock:
             pending_count = len(self.pending_changes)
@@ -209,77 +240,66 @@ class AutoSyncWorker(threading.Thread):
         if self.on_health_status:
             self.on_health_status(status)
 
-    def _update_file(self, rel_path: str, change_type: str) -> int:
+    def _load_file(self, rel_path: str, change_type: str) -> Optional[list]:
+        # Chunks to store for the file (empty when its rows only need
+        # deleting), or None to leave the index untouched
         abs_path = self.project_path / rel_path
 
-        if change_type == ChangeEvent.DELETED:
-            self.vector_db.delete_by_file(rel_path)
-            return 0
-
-
-        if not abs_path.exists():
-            self.vector_db.delete_by_file(rel_path)
-            return 0
-
-        file_size = abs_path.stat().st_size
-        if file_size > AppConfig.MAX_FILE_SIZE:
-            return 0
+        if change_type == ChangeEvent.DELETED or not abs_path.exists():
+            return []
 
         try:
-            with open(abs_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            content = read_source_text(abs_path, AppConfig.MAX_FILE_SIZE)
         except Exception as e:
             raise Exception(f"Failed to read file: {e}")
 
+        if content is None:
+            return None
+
         parse_result = self.parser.parse_file(str(abs_path), content)
         if not parse_result:
             raise Exception("Parsing failed")
 
-        chunks = self.chunker.chunk_code(
+        return self.chunker.chunk_code(
             content,
             rel_path,
             parse_result['language'],
             parse_result.get('nodes')
-        )
-
-        if not chunks:
-            self.vector_db.delete_by_file(rel_path)
-            return 0
+        ) or []
 
-        chunk_texts = [chunk.content for chunk in chunks]
-        embeddings = self.embedding_gen.generate_embeddings(chunk_texts)
+    def _store_batch(self, loaded: List[tuple]) -> int:
+        delete_paths = [file_path for file_path, chunks in loaded if chunks is not None]
+        chunks = [chunk for _, file_chunks in loaded if file_chunks for chunk in file_chunks]
 
-        chunk_dicts = [chunk.to_dict() for chunk in chunks]
+        embeddings = None
+        if chunks:
+            embeddings = self.embedding_gen.generate_embeddings([chunk.content for chunk in chunks])
 
-        self.vector_db.delete_by_file(rel_path)
-        self.vector_db.add_chunks(chunk_dicts, embeddings)
+        # add_chunks rebuilds the FTS index right after
+        self.vector_db.delete_by_files(delete_paths, update_fts=not chunks)
+        if chunks:
+            self.vector_db.add_chunks([chunk.to_dict() for chunk in chunks], embeddings)
 
         return len(chunks)
 
     def _should_process(self, file_path: str) -> bool:
         path = Path(file_path)
 
+        # Cheap extension check before the Pygments lexer lookup
+        if not get_watch_regex().match(path.name):
+            return False
+
+        if not should_process_file(path, project_path=self.project_path):
+            return False
+
         language = self.parser.get_language_from_extension(str(path))
         if not language:
             return False
 
-        path_str = str(path)
-        for pattern in AppConfig.DEFAULT_IGNORE_PATTERNS:
-            if pattern in path_str:
-                return False
-
         return True
 
     def _get_watch_patterns(self) -> list:
-        supported_exts = self.parser.get_all_supported_extensions()
-        return [f"*{ext}" for ext in supported_exts]
+        return list(get_watch_patterns())
 
     def _get_ignore_patterns(self) -> list:
-        ignore = []
-        for pattern in AppConfig.DEFAULT_IGNORE_PATTERNS:
-            if pattern.startswith('*.'):
-                ignore.append(pattern)
-            else:
-                ignore.append(f"*/{pattern}/*")
-                ignore.append(f"*{pattern}*")
-        return ignore
+        return get_ignore_patterns()
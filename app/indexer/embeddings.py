@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Dict, Tuple, Any
 import os
 import sys
 import pickle
@@ -21,6 +21,10 @@ SentenceTransformer = None
 
 
 class EmbeddingGenerator:
+    # Loaded models shared by every generator in the process, keyed by the
+    # requested (model name, backend, model file)
+    _loaded_models: Dict[Tuple[str, str, Optional[str]], Tuple[Any, str, Optional[str]]] = {}
+
     def __init__(self, model_name: Optional[str] = None):
         config_model = model_name or AppConfig.get_embedding_model() or 'all-MiniLM-L6-v2'
 
@@ -30,6 +34,9 @@ class EmbeddingGenerator:
         else:
             self.model_name = config_model
 
+        self.model_info = model_info
+        self.backend, self.model_file = AppConfig.get_embedding_backend(config_model)
+
         self.model = None
         self._cache_dir = AppConfig.HOME_DIR / "model_cache"
         self._cache_dir.mkdir(exist_ok=True, parents=True)
@@ -39,6 +46,9 @@ class EmbeddingGenerator:
         model_hash = hashlib.md5(self.model_name.encode()).hexdigest()[:16]
         return self._cache_dir / f"{model_hash}.pkl"
 
+    def _model_key(self) -> Tuple[str, str, Optional[str]]:
+        return (self.model_name, self.backend, self.model_file)
+
     def _save_model_cache(self):
         if self.model is None:
             return
@@ -83,21 +93,39 @@ class EmbeddingGenerator:
             self.model = None
             return
 
-        if self._load_model_cache():
+        requested_key = self._model_key()
+        cached = EmbeddingGenerator._loaded_models.get(requested_key)
+        if cached is not None:
+            self.model, self.backend, self.model_file = cached
             return
 
-        try:
-            model_info = AppConfig.get_embedding_model_info(AppConfig.get_embedding_model())
-            trust_remote_code = model_info.get('trust_remote_code', False) if model_info else False
+        trust_remote_code = self.model_info.get('trust_remote_code', False) if self.model_info else False
+
+        if self.backend == "onnx":
+            try:
+                self.model = SentenceTransformer(
+                    self.model_name,
+                    backend="onnx",
+                    model_kwargs={"file_name": self.model_file},
+                    trust_remote_code=trust_remote_code
+                )
+            except Exception:
+                self.backend, self.model_file = "torch", None
+                self.model = None
 
-            self.model = SentenceTransformer(
-                self.model_name,
-                trust_remote_code=trust_remote_code
-            )
-            self._save_model_cache()
+        if self.model is None and not self._load_model_cache():
+            try:
+                self.model = SentenceTransformer(
+                    self.model_name,
+                    trust_remote_code=trust_remote_code
+                )
+                self._save_model_cache()
 
-        except Exception:
-            self.model = None
+            except Exception:
+                self.model = None
+
+        if self.model is not None:
+            EmbeddingGenerator._loaded_models[requested_key] = (self.model, self.backend, self.model_file)
 
     def generate_embeddings(
         self,
@@ -1,17 +1,24 @@
 from typing import List, Optional, Dict
 from pathlib import Path
 from datetime import datetime
+import os
+import queue
 import shutil
+import threading
 import time
-from app.indexer.parser import TreeSitterParser
 from app.indexer.chunker import CodeChunker
 from app.indexer.embeddings import EmbeddingGenerator
 from app.search.vector_db import VectorDatabase
 from app.utils.config import AppConfig
+from app.core.file_filters import find_files
+from app.core.parse_worker import LoadedFile, iter_loaded_files
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Texts per model forward pass in generate_embeddings
+_ENCODE_BATCH_SIZE = 32
+
 
 class IndexingCallbacks:
     def on_progress(self, current: int, total: int, filename: str):
@@ -27,6 +34,43 @@ class IndexingCallbacks:
         pass
 
 
+class _ChunkWriter(threading.Thread):
+    # Stores embedded batches in the background so the next files are read,
+    # parsed and embedded while the vector store write is in flight
+    def __init__(self, vector_db: VectorDatabase, max_pending: int = 4):
+        super().__init__(daemon=True)
+        self.vector_db = vector_db
+        self._queue = queue.Queue(maxsize=max_pending)
+        self.stored_chunks = 0
+        self.error: Optional[str] = None
+
+    def run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            # After a failed write the rest is drained unstored, so the
+            # producer never blocks on a full queue
+            if self.error:
+                continue
+
+            chunk_dicts, embeddings, update_fts = item
+            try:
+                self.vector_db.add_chunks(chunk_dicts, embeddings, update_fts=update_fts)
+                self.stored_chunks += len(chunk_dicts)
+            except Exception as e:
+                logger.error(f"Failed to store batch of {len(chunk_dicts)} chunks: {e}")
+                self.error = str(e)
+
+    def submit(self, chunk_dicts: List[Dict], embeddings, update_fts: bool) -> None:
+        self._queue.put((chunk_dicts, embeddings, update_fts))
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self.join()
+
+
 class IndexingResult:
     def __init__(self):
         self.success: bool = False
@@ -77,13 +121,13 @@ class CoreIndexer:
                 shutil.rmtree(project_dir)
                 callbacks.on_log("Previous project data cleared completely")
 
-            parser = TreeSitterParser()
             chunker = CodeChunker()
             embedding_gen = EmbeddingGenerator()
             embedding_dim = embedding_gen.get_embedding_dim()
             vector_db = VectorDatabase(
                 project_path=str(self.project_path),
-                embedding_dim=embedding_dim
+                embedding_dim=embedding_dim,
+                metric="dot"
             )
 
             callbacks.on_log(f"Scanning directory: {self.project_path}")
@@ -99,154 +143,109 @@ class CoreIndexer:
             EMBEDDING_BATCH_SIZE = AppConfig.EMBEDDING_BATCH_SIZE or 100
             all_chunks = []
 
-            total_chunks = 0
             total_embedding_time = 0.0
 
-            for i, file_path in enumerate(files):
-                if callbacks.should_cancel():
-                    callbacks.on_log("Indexing cancelled by user")
-                    result.error = "Cancelled by user"
-                    return result
-
-                callbacks.on_progress(i + 1, len(files), file_path.name)
-
-                try:
-                    file_stat = file_path.stat()
-                    size_bytes = file_stat.st_size
-
-                    if size_bytes > AppConfig.MAX_FILE_SIZE:
-                        size_mb = size_bytes / (1024 * 1024)
-                        result.skipped_files.append(str(file_path.relative_to(self.project_path)))
-                        result.skipped_files_count += 1
-                        callbacks.on_log(f"Skipping {file_path.name} (file too large: {size_mb:.1f}MB)")
-                        callbacks.on_file_processed(file_path.name, "skipped", 0)
-                        continue
-
-                    try:
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
-                    except Exception as e:
-                        result.failed_files.append({
-                            'file': str(file_path.relative_to(self.project_path)),
-                            'error_type': 'encoding_error',
-                            'message': str(e)
-                        })
-                        result.failed_files_count += 1
-                        callbacks.on_log(f"Failed {file_path.name} (encoding error): {str(e)}")
-                        callbacks.on_file_processed(file_path.name, "failed", 0)
-                        continue
-
-                    parse_result = parser.parse_file(str(file_path), content)
-                    if not parse_result:
+            # find_files yields paths under the project root, so slicing off
+            # the root is enough for the relative path
+            root_len = len(os.path.join(str(self.project_path), ''))
+            tasks = [(file_path, str(file_path)[root_len:]) for file_path in files]
+
+            loaded_files = iter_loaded_files(chunker, tasks)
+            writer = _ChunkWriter(vector_db)
+            writer.start()
+            try:
+                for i, (file_path, rel_path) in enumerate(tasks):
+                    if callbacks.should_cancel():
+                        callbacks.on_log("Indexing cancelled by user")
+                        result.error = "Cancelled by user"
+                        return result
+
+                    callbacks.on_progress(i + 1, len(files), file_path.name)
+                    loaded = next(loaded_files)
+
+                    if loaded.status == "failed":
                         result.failed_files.append({
-                            'file': str(file_path.relative_to(self.project_path)),
-                            'error_type': 'parse_error',
-                            'message': 'Failed to parse file'
+                            'file': rel_path,
+                            'error_type': loaded.error_type,
+                            'message': loaded.message
                         })
                         result.failed_files_count += 1
-                        callbacks.on_log(f"Failed {file_path.name} (parse failed)")
+                        callbacks.on_log(self._failure_log(file_path.name, loaded))
                         callbacks.on_file_processed(file_path.name, "failed", 0)
+                        if loaded.error_type == 'unknown':
+                            logger.warning(f"Failed to index {file_path}: {loaded.message}")
                         continue
 
-                    chunks = chunker.chunk_code(
-                        content,
-                        str(file_path.relative_to(self.project_path)),
-                        parse_result['language'],
-                        parse_result.get('nodes')
-                    )
-
-                    if not chunks:
-                        result.skipped_files.append(str(file_path.relative_to(self.project_path)))
-                        result.skipped_files_count += 1
-                        callbacks.on_file_processed(file_path.name, "skipped", 0)
-                        continue
-
-                    file_imports = parse_result.get('imports', [])
-                    imports_str = ','.join(file_imports) if file_imports else ''
-
-                    for chunk in chunks:
-                        chunk.imports = imports_str
-
-                    chunks = [chunk for chunk in chunks if chunk.is_high_quality()]
-
-                    if not chunks:
-                        result.skipped_files.append(str(file_path.relative_to(self.project_path)))
+                    if loaded.status == "skipped":
+                        result.skipped_files.append(rel_path)
                         result.skipped_files_count += 1
+                        if loaded.message:
+                            callbacks.on_log(f"Skipping {file_path.name} ({loaded.message})")
                         callbacks.on_file_processed(file_path.name, "skipped", 0)
                         continue
 
+                    chunks = loaded.chunks
                     all_chunks.extend(chunks)
 
-                    language = parse_result['language']
+                    language = loaded.language
                     result.language_breakdown[language] = result.language_breakdown.get(language, 0) + 1
 
-                    result.indexed_files.append(str(file_path.relative_to(self.project_path)))
+                    result.indexed_files.append(rel_path)
                     result.indexed_files_count += 1
 
                     callbacks.on_log(f"Processed {file_path.name}: {len(chunks)} chunks (total buffered: {len(all_chunks)})")
                     callbacks.on_file_processed(file_path.name, "indexed", len(chunks))
 
                     if len(all_chunks) >= EMBEDDING_BATCH_SIZE:
-                        chunk_texts = [chunk.to_embedding_text() for chunk in all_chunks]
-
-                        embed_start = time.time()
-                        embeddings = embedding_gen.generate_embeddings(
-                            chunk_texts,
-                            task="retrieval.passage"
-                        )
-                        total_embedding_time += (time.time() - embed_start)
-
-                        chunk_dicts = [chunk.to_dict() for chunk in all_chunks]
-                        is_last_batch = (i == len(files) - 1)
-                        vector_db.add_chunks(chunk_dicts, embeddings, update_fts=is_last_batch)
-
-                        total_chunks += len(all_chunks)
-                        callbacks.on_log(f"Batch indexed: {len(all_chunks)} chunks")
-
-                        all_chunks = []
-
-                except PermissionError as e:
-                    result.failed_files.append({
-                        'file': str(file_path.relative_to(self.project_path)),
-                        'error_type': 'permission_error',
-                        'message': str(e)
-                    })
-                    result.failed_files_count += 1
-                    callbacks.on_log(f"Failed {file_path.name} (permission denied): {str(e)}")
-                    callbacks.on_file_processed(file_path.name, "failed", 0)
-
-                except Exception as e:
-                    result.failed_files.append({
-                        'file': str(file_path.relative_to(self.project_path)),
-                        'error_type': 'unknown',
-                        'message': str(e)
-                    })
-                    result.failed_files_count += 1
-                    callbacks.on_log(f"Failed {file_path.name} (error): {str(e)}")
-                    callbacks.on_file_processed(file_path.name, "failed", 0)
-                    logger.warning(f"Failed to index {file_path}: {e}")
-
-            if all_chunks:
-                callbacks.on_log(f"Processing final batch: {len(all_chunks)} chunks")
-                chunk_texts = [chunk.to_embedding_text() for chunk in all_chunks]
-
-                embed_start = time.time()
-                embeddings = embedding_gen.generate_embeddings(
-                    chunk_texts,
-                    task="retrieval.passage"
-                )
-                total_embedding_time += (time.time() - embed_start)
-
-                chunk_dicts = [chunk.to_dict() for chunk in all_chunks]
-                vector_db.add_chunks(chunk_dicts, embeddings, update_fts=True)
-
-                total_chunks += len(all_chunks)
-                callbacks.on_log(f"Final batch indexed: {len(all_chunks)} chunks")
+                        # Only whole encoder batches go out; the remainder
+                        # waits for the next files, so the model runs a short
+                        # batch once per index instead of once per flush
+                        flush_count = len(all_chunks) - len(all_chunks) % _ENCODE_BATCH_SIZE
+                        batch = all_chunks[:flush_count] if flush_count else all_chunks
+                        all_chunks = all_chunks[len(batch):]
+                        is_last_batch = (i == len(files) - 1) and not all_chunks
+
+                        try:
+                            total_embedding_time += self._embed_and_submit(
+                                embedding_gen, writer, batch, update_fts=is_last_batch
+                            )
+                            callbacks.on_log(f"Batch indexed: {len(batch)} chunks")
+
+                        except Exception as e:
+                            result.failed_files.append({
+                                'file': rel_path,
+                                'error_type': 'unknown',
+                                'message': str(e)
+                            })
+                            result.failed_files_count += 1
+                            callbacks.on_log(f"Failed {file_path.name} (error): {str(e)}")
+                            callbacks.on_file_processed(file_path.name, "failed", 0)
+                            logger.warning(f"Failed to index {file_path}: {e}")
+
+                if all_chunks:
+                    callbacks.on_log(f"Processing final batch: {len(all_chunks)} chunks")
+                    total_embedding_time += self._embed_and_submit(
+                        embedding_gen, writer, all_chunks, update_fts=True
+                    )
+                    callbacks.on_log(f"Final batch indexed: {len(all_chunks)} chunks")
+            finally:
+                loaded_files.close()
+                writer.close()
+
+            if writer.error:
+                raise RuntimeError(f"Failed to store chunks: {writer.error}")
+            total_chunks = writer.stored_chunks
 
             model_info = AppConfig.get_embedding_model_info(embedding_gen.model_name)
             metadata = AppConfig.load_project_metadata(str(self.project_path))
             metadata["embedding_model"] = embedding_gen.model_name
             metadata["embedding_dim"] = model_info.get("dim") if model_info else None
+            metadata["normalized"] = True
+
+            ann_index_rows = vector_db.ensure_ann_index(metadata.get("ann_index_rows", 0))
+            if ann_index_rows:
+                callbacks.on_log(f"ANN index covers {ann_index_rows} chunks")
+                metadata["ann_index_rows"] = ann_index_rows
             AppConfig.save_project_metadata(str(self.project_path), metadata)
 
             result.success = True
@@ -268,27 +267,35 @@ class CoreIndexer:
             callbacks.on_log(f"Indexing failed: {str(e)}")
             return result
 
-    def _find_files(self) -> List[Path]:
-        files = []
-        parser = TreeSitterParser()
-
-        supported_exts = parser.get_all_supported_extensions()
+    @staticmethod
+    def _embed_and_submit(
+        embedding_gen: EmbeddingGenerator,
+        writer: _ChunkWriter,
+        chunks: list,
+        update_fts: bool
+    ) -> float:
+        chunk_texts = [chunk.to_embedding_text() for chunk in chunks]
+
+        embed_start = time.time()
+        embeddings = embedding_gen.generate_embeddings(
+            chunk_texts,
+            batch_size=_ENCODE_BATCH_SIZE,
+            task="retrieval.passage"
+        )
+        embedding_time = time.time() - embed_start
+
+        writer.submit([chunk.to_dict() for chunk in chunks], embeddings, update_fts)
+        return embedding_time
+
+    @staticmethod
+    def _failure_log(filename: str, loaded: LoadedFile) -> str:
+        if loaded.error_type == 'parse_error':
+            return f"Failed {filename} (parse failed)"
+        reason = {
+            'encoding_error': "encoding error",
+            'permission_error': "permission denied"
+        }.get(loaded.error_type, "error")
+        return f"Failed {filename} ({reason}): {loaded.message}"
 
-        for file_path in self.project_path.rglob('*'):
-            if not file_path.is_file():
-                continue
-
-            if self._should_ignore(file_path):
-                continue
-
-            if file_path.suffix.lower() in supported_exts:
-                files.append(file_path)
-
-        return files
-
-    def _should_ignore(self, file_path: Path) -> bool:
-        path_str = str(file_path)
-        for pattern in AppConfig.DEFAULT_IGNORE_PATTERNS:
-            if pattern in path_str:
-                return True
-        return False
+    def _find_files(self) -> List[Path]:
+        return find_files(self.project_path)
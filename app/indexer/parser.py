@@ -1,5 +1,6 @@
 from pathlib import Path
-from typing import Optional, List, Dict, Set
+from typing import Optional, List, Dict, FrozenSet
+from functools import lru_cache
 import json
 import tree_sitter_python as tspython
 import tree_sitter_javascript as tsjavascript
@@ -89,19 +90,23 @@ class TreeSitterParser:
             except Exception as e:
                 logger.error(f"Failed to initialize parser for {lang_name}: {e}")
 
-    def get_all_supported_extensions(self) -> Set[str]:
+    @classmethod
+    @lru_cache(maxsize=None)
+    def get_all_supported_extensions(cls) -> FrozenSet[str]:
+        # Scanning every Pygments lexer takes ~300ms and the result only
+        # depends on the class mapping, so it is computed once per process
         from pygments.lexers import get_all_lexers
 
         supported_exts = set()
 
         for lexer_name, aliases, patterns, mimetypes in get_all_lexers():
-            if lexer_name in self.PYGMENTS_TO_PARSER:
+            if lexer_name in cls.PYGMENTS_TO_PARSER:
                 for pattern in patterns:
                     if pattern.startswith('*.'):
                         ext = pattern[1:]
                         supported_exts.add(ext.lower())
 
-        return supported_exts
+        return frozenset(supported_exts)
 
     def get_language_from_extension(self, file_path: str) -> Optional[str]:
         try:
@@ -1,11 +1,15 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, FrozenSet
+import heapq
 import re
 import time
+import numpy as np
 from app.search.vector_db import VectorDatabase
 from app.indexer.embeddings import EmbeddingGenerator
 from app.search.reranker import CrossEncoderReranker
 from app.utils.config import AppConfig
 
+_WORD_RE = re.compile(r'\w+')
+
 
 class HybridSearch:
     def __init__(
@@ -24,27 +28,46 @@ class HybridSearch:
         query: str,
         mode: str = "hybrid",
         limit: int = AppConfig.DEFAULT_SEARCH_LIMIT,
-        filters: Optional[Dict] = None
+        filters: Optional[Dict] = None,
+        language: Optional[str] = None,
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[Dict]:
+        """
+        Run a search in the given mode.
+
+        Filters (including `language`) are combined into a single predicate that
+        LanceDB applies before the vector/FTS search, so rows from other
+        languages are pruned up front instead of being scored and discarded.
+        `query_embedding` skips encoding when the caller has already embedded
+        the query (e.g. as part of a batch).
+        """
+        if language:
+            filters = {**(filters or {}), 'language': language}
+
         if mode == "vector":
-            return self._vector_search(query, limit, filters)
+            return self._vector_search(query, limit, filters, query_embedding)
         elif mode == "keyword":
             return self._keyword_search(query, limit, filters)
         elif mode == "hybrid":
-            return self._hybrid_search(query, limit, filters)
+            return self._hybrid_search(query, limit, filters, query_embedding)
         else:
-            return self._hybrid_search(query, limit, filters)
+            return self._hybrid_search(query, limit, filters, query_embedding)
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        return self.embedding_gen.generate_embeddings(
+            queries,
+            task="retrieval.query"
+        )
 
     def _vector_search(
         self,
         query: str,
         limit: int,
-        filters: Optional[Dict]
+        filters: Optional[Dict],
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[Dict]:
-        query_embedding = self.embedding_gen.generate_embeddings(
-            [query],
-            task="retrieval.query"
-        )[0]
+        if query_embedding is None:
+            query_embedding = self.embed_queries([query])[0]
 
         results = self.vector_db.vector_search(query_embedding, limit, filters)
 
@@ -70,10 +93,11 @@ class HybridSearch:
         self,
         query: str,
         limit: int,
-        filters: Optional[Dict]
+        filters: Optional[Dict],
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[Dict]:
         fetch_limit = int(limit * 1.5)
-        vector_results = self._vector_search(query, fetch_limit, filters)
+        vector_results = self._vector_search(query, fetch_limit, filters, query_embedding)
         keyword_results = self._keyword_search(query, fetch_limit, filters)
 
         # RRF fusion with adaptive K and symbol boosting
@@ -120,7 +144,12 @@ class HybridSearch:
         # Default balanced ranking
         return self.rrf_k
 
-    def _calculate_symbol_boost(self, result: Dict, query: str) -> float:
+    def _calculate_symbol_boost(
+        self,
+        result: Dict,
+        query: str,
+        query_terms: Optional[FrozenSet[str]] = None
+    ) -> float:
         """
         Calculate automatic symbol-aware boost score for a result.
 
@@ -133,8 +162,8 @@ class HybridSearch:
         - -0.05 * depth: Penalty for nested scopes
         """
         boost = 0.0
-        query_lower = query.lower()
-        query_terms = set(re.findall(r'\w+', query_lower))
+        if query_terms is None:
+            query_terms = self._query_terms(query)
 
         # Node name matching
         node_name = result.get('node_name', '').lower()
@@ -166,6 +195,10 @@ class HybridSearch:
 
         return boost
 
+    @staticmethod
+    def _query_terms(query: str) -> FrozenSet[str]:
+        return frozenset(_WORD_RE.findall(query.lower()))
+
     def _rrf_fusion(
         self,
         query: str,
@@ -192,20 +225,22 @@ class HybridSearch:
 
                 rrf_scores[doc_id]['score'] += score
 
-        # Apply symbol-aware boosting
+        # Apply symbol-aware boosting (query terms are the same for every result)
+        query_terms = self._query_terms(query)
         for doc_id, item in rrf_scores.items():
-            symbol_boost = self._calculate_symbol_boost(item['result'], query)
+            symbol_boost = self._calculate_symbol_boost(item['result'], query, query_terms)
             item['score'] += symbol_boost
             item['result']['symbol_boost'] = symbol_boost
 
-        sorted_results = sorted(
+        # Same order as a stable descending sort truncated to `limit`
+        top_items = heapq.nlargest(
+            limit,
             rrf_scores.values(),
-            key=lambda x: x['score'],
-            reverse=True
+            key=lambda x: x['score']
         )
 
         final_results = []
-        for item in sorted_results[:limit]:
+        for item in top_items:
             result = item['result']
             result['rrf_score'] = item['score']
             result['adaptive_k'] = adaptive_k
@@ -1,8 +1,10 @@
 import lancedb
+import math
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Any
 import numpy as np
 import pyarrow as pa
+import pyarrow.compute as pc
 import threading
 import logging
 import os
@@ -10,13 +12,19 @@ from app.utils.config import AppConfig
 
 logger = logging.getLogger(__name__)
 
+_TEXT_FIELDS = (
+    "node_name", "signature", "parameters", "return_type", "docstring",
+    "decorators", "imports", "parent_scope", "full_path", "calls"
+)
+
 
 class VectorDatabase:
     def __init__(
         self,
         db_path: Optional[Path] = None,
         project_path: Optional[str] = None,
-        embedding_dim: int = AppConfig.EMBEDDING_DIM
+        embedding_dim: int = AppConfig.EMBEDDING_DIM,
+        metric: Optional[str] = None
     ):
         if db_path:
             self.db_path = db_path
@@ -28,12 +36,20 @@ class VectorDatabase:
 
         self.project_path = project_path
         self.embedding_dim = embedding_dim
+        self.metric = metric or self._resolve_metric(project_path)
         self.db = None
         self.table = None
         self._lock = threading.RLock()
         self._connect()
         self.create_table(embedding_dim=self.embedding_dim)
 
+    @staticmethod
+    def _resolve_metric(project_path: Optional[str]) -> str:
+        # Unit-norm vectors make cosine equal to a plain dot product
+        if project_path and AppConfig.load_project_metadata(project_path).get("normalized"):
+            return "dot"
+        return "cosine"
+
     def _connect(self):
         try:
             self.db_path.mkdir(exist_ok=True, parents=True)
@@ -42,30 +58,34 @@ class VectorDatabase:
             logger.error(f"Failed to connect to database at {self.db_path}: {e}")
             raise RuntimeError(f"Database connection failed: {e}") from e
 
+    @staticmethod
+    def _schema(embedding_dim: int) -> pa.Schema:
+        return pa.schema([
+            pa.field("id", pa.string()),
+            pa.field("content", pa.string()),
+            pa.field("file_path", pa.string()),
+            pa.field("start_line", pa.int32()),
+            pa.field("end_line", pa.int32()),
+            pa.field("language", pa.string()),
+            pa.field("chunk_type", pa.string()),
+            pa.field("node_name", pa.string()),
+            pa.field("signature", pa.string()),
+            pa.field("parameters", pa.string()),
+            pa.field("return_type", pa.string()),
+            pa.field("docstring", pa.string()),
+            pa.field("decorators", pa.string()),
+            pa.field("imports", pa.string()),
+            pa.field("parent_scope", pa.string()),
+            pa.field("full_path", pa.string()),
+            pa.field("scope_depth", pa.int32()),
+            pa.field("calls", pa.string()),
+            pa.field("vector", pa.list_(pa.float32(), embedding_dim))
+        ])
+
     def create_table(self, embedding_dim: int = AppConfig.EMBEDDING_DIM):
         with self._lock:
             try:
-                schema = pa.schema([
-                    pa.field("id", pa.string()),
-                    pa.field("content", pa.string()),
-                    pa.field("file_path", pa.string()),
-                    pa.field("start_line", pa.int32()),
-                    pa.field("end_line", pa.int32()),
-                    pa.field("language", pa.string()),
-                    pa.field("chunk_type", pa.string()),
-                    pa.field("node_name", pa.string()),
-                    pa.field("signature", pa.string()),
-                    pa.field("parameters", pa.string()),
-                    pa.field("return_type", pa.string()),
-                    pa.field("docstring", pa.string()),
-                    pa.field("decorators", pa.string()),
-                    pa.field("imports", pa.string()),
-                    pa.field("parent_scope", pa.string()),
-                    pa.field("full_path", pa.string()),
-                    pa.field("scope_depth", pa.int32()),
-                    pa.field("calls", pa.string()),
-                    pa.field("vector", pa.list_(pa.float32(), embedding_dim))
-                ])
+                schema = self._schema(embedding_dim)
 
                 table_names = self.db.table_names()
                 if AppConfig.DB_TABLE_NAME in table_names:
@@ -94,13 +114,84 @@ class VectorDatabase:
                 logger.error(f"Failed to create table '{AppConfig.DB_TABLE_NAME}': {e}")
                 raise RuntimeError(f"Table creation failed: {e}") from e
 
+    def _has_fts_index(self) -> bool:
+        try:
+            for index in self.table.list_indices():
+                if "content" in index.columns and "fts" in str(index.index_type).lower():
+                    return True
+        except Exception as e:
+            logger.debug(f"Failed to list indices: {e}")
+        return False
+
     def _ensure_fts_index(self):
+        # Opening the table must not rebuild the index: that rewrites it and
+        # commits a new table version on every search
+        if self._has_fts_index():
+            return
+
         try:
             self.table.create_fts_index("content", replace=True)
             logger.debug("FTS index created/updated successfully")
         except Exception as e:
             logger.warning(f"Failed to create FTS index (keyword search may not work): {e}")
 
+    def create_ann_index(
+        self,
+        metric: Optional[str] = None,
+        index_type: Optional[str] = None,
+        num_partitions: Optional[int] = None
+    ) -> bool:
+        with self._lock:
+            if self.table is None:
+                return False
+
+            try:
+                row_count = self.table.count_rows()
+                metric = metric or self.metric
+                index_type = index_type or AppConfig.ANN_INDEX_TYPE
+                num_partitions = num_partitions or max(1, int(math.sqrt(row_count)))
+
+                num_sub_vectors = None
+                if index_type.endswith("_PQ") and self.embedding_dim % 16 == 0:
+                    num_sub_vectors = self.embedding_dim // 16
+
+                self.table.create_index(
+                    metric=metric,
+                    num_partitions=num_partitions,
+                    num_sub_vectors=num_sub_vectors,
+                    vector_column_name="vector",
+                    replace=True,
+                    index_type=index_type
+                )
+                logger.info(
+                    f"{index_type} index built on {row_count} rows "
+                    f"({num_partitions} partitions)"
+                )
+                return True
+            except Exception as e:
+                logger.warning(f"Failed to create ANN index (falling back to flat search): {e}")
+                return False
+
+    def ensure_ann_index(self, indexed_rows: int = 0) -> int:
+        if self.table is None:
+            return indexed_rows
+
+        try:
+            row_count = self.table.count_rows()
+        except Exception as e:
+            logger.warning(f"Failed to count rows for ANN index: {e}")
+            return indexed_rows
+
+        if row_count < AppConfig.ANN_INDEX_MIN_ROWS:
+            return indexed_rows
+
+        if indexed_rows and row_count < indexed_rows * 2:
+            return indexed_rows
+
+        if self.create_ann_index():
+            return row_count
+        return indexed_rows
+
     def _refresh_table(self):
         with self._lock:
             try:
@@ -138,33 +229,7 @@ class VectorDatabase:
                         f"got {actual_dim}. Check your embedding model configuration."
                     )
 
-                data = []
-                for i, chunk in enumerate(chunks):
-                    vector_list = embeddings[i].tolist()
-
-                    data.append({
-                        "id": f"{chunk['file_path']}:{chunk['start_line']}",
-                        "content": chunk['content'],
-                        "file_path": chunk['file_path'],
-                        "start_line": chunk['start_line'],
-                        "end_line": chunk['end_line'],
-                        "language": chunk['language'],
-                        "chunk_type": chunk['chunk_type'],
-                        "node_name": chunk.get('node_name', ''),
-                        "signature": chunk.get('signature', ''),
-                        "parameters": chunk.get('parameters', ''),
-                        "return_type": chunk.get('return_type', ''),
-                        "docstring": chunk.get('docstring', ''),
-                        "decorators": chunk.get('decorators', ''),
-                        "imports": chunk.get('imports', ''),
-                        "parent_scope": chunk.get('parent_scope', ''),
-                        "full_path": chunk.get('full_path', ''),
-                        "scope_depth": chunk.get('scope_depth', 0),
-                        "calls": chunk.get('calls', ''),
-                        "vector": vector_list
-                    })
-
-                pa_data = pa.Table.from_pylist(data)
+                pa_data = self._chunks_to_arrow(chunks, embeddings, actual_dim)
 
                 if self.table is None:
                     self.table = self.db.create_table(
@@ -186,6 +251,44 @@ class VectorDatabase:
                 logger.error(f"Failed to add chunks to database: {e}")
                 raise RuntimeError(f"Failed to add chunks: {e}") from e
 
+    @classmethod
+    def _chunks_to_arrow(cls, chunks: List[Dict], embeddings: np.ndarray, embedding_dim: int) -> pa.Table:
+        # Built column by column; the vector column wraps the float32 buffer
+        # instead of turning every embedding into a Python list of floats
+        vectors = np.ascontiguousarray(np.asarray(embeddings)[:len(chunks)], dtype=np.float32)
+        columns = {
+            "id": [f"{chunk['file_path']}:{chunk['start_line']}" for chunk in chunks],
+            "content": [chunk['content'] for chunk in chunks],
+            "file_path": [chunk['file_path'] for chunk in chunks],
+            "start_line": [chunk['start_line'] for chunk in chunks],
+            "end_line": [chunk['end_line'] for chunk in chunks],
+            "language": [chunk['language'] for chunk in chunks],
+            "chunk_type": [chunk['chunk_type'] for chunk in chunks],
+            "scope_depth": [chunk.get('scope_depth', 0) for chunk in chunks],
+        }
+        for field in _TEXT_FIELDS:
+            columns[field] = [chunk.get(field, '') for chunk in chunks]
+
+        schema = cls._schema(embedding_dim)
+        arrays = [
+            pa.array(columns[field.name], type=field.type)
+            for field in schema
+            if field.name != "vector"
+        ]
+        arrays.append(pa.FixedSizeListArray.from_arrays(pa.array(vectors.ravel()), embedding_dim))
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    @staticmethod
+    def _build_where(filters: Optional[Dict]) -> Optional[str]:
+        if not filters:
+            return None
+
+        clauses = []
+        for key, value in filters.items():
+            safe_value = str(value).replace("'", "''")
+            clauses.append(f"{key} = '{safe_value}'")
+        return " AND ".join(clauses)
+
     def vector_search(
         self,
         query_vector: np.ndarray,
@@ -197,13 +300,12 @@ class VectorDatabase:
 
         try:
             results = self.table.search(query_vector.tolist())\
-                .metric("cosine")\
+                .metric(self.metric)\
                 .limit(limit)
 
-            if filters:
-                for key, value in filters.items():
-                    safe_value = str(value).replace("'", "''")
-                    results = results.where(f"{key} = '{safe_value}'")
+            where = self._build_where(filters)
+            if where:
+                results = results.where(where, prefilter=True)
 
             results_list = results.to_list()
 
@@ -228,10 +330,9 @@ class VectorDatabase:
         try:
             results = self.table.search(query, query_type="fts").limit(limit)
 
-            if filters:
-                for key, value in filters.items():
-                    safe_value = str(value).replace("'", "''")
-                    results = results.where(f"{key} = '{safe_value}'")
+            where = self._build_where(filters)
+            if where:
+                results = results.where(where, prefilter=True)
 
             results_list = results.to_list()
             return results_list
@@ -256,6 +357,26 @@ class VectorDatabase:
             except Exception as e:
                 logger.error(f"Failed to delete file '{file_path}': {e}")
 
+    def delete_by_files(self, file_paths: List[str], update_fts: bool = True):
+        # One delete, table refresh and FTS rebuild for the whole batch
+        if self.table is None or not file_paths:
+            return
+
+        with self._lock:
+            try:
+                safe_file_paths = ", ".join(
+                    "'" + file_path.replace("'", "''") + "'" for file_path in file_paths
+                )
+                self.table.delete(f"file_path IN ({safe_file_paths})")
+
+                self._refresh_table()
+
+                if update_fts:
+                    self._update_fts_index()
+
+            except Exception as e:
+                logger.error(f"Failed to delete {len(file_paths)} files: {e}")
+
     def clear_table(self):
         if self.table is None:
             return
@@ -283,17 +404,38 @@ class VectorDatabase:
             logger.error(f"Failed to get stats: {e}")
             return {"count": 0}
 
+    def _scan_columns(self, columns: List[str]) -> pa.Table:
+        # Projected scan: the aggregates never need the content or vector columns
+        return self.table.search().select(columns).limit(None).to_arrow()
+
+    @staticmethod
+    def _files_per_language(data: pa.Table) -> Dict[str, int]:
+        grouped = data.group_by('language').aggregate([('file_path', 'count_distinct')])
+        counts = {
+            language: count
+            for language, count in zip(
+                grouped['language'].to_pylist(),
+                grouped['file_path_count_distinct'].to_pylist()
+            )
+            if language is not None
+        }
+        return dict(sorted(counts.items()))
+
+    @staticmethod
+    def _chunks_per_type(data: pa.Table) -> Dict[str, int]:
+        counts = [
+            (item['values'], item['counts'])
+            for item in pc.value_counts(data['chunk_type']).to_pylist()
+            if item['values'] is not None
+        ]
+        return dict(sorted(counts, key=lambda item: item[1], reverse=True))
+
     def get_language_breakdown(self) -> Dict[str, int]:
         if self.table is None:
             return {}
 
         try:
-            df = self.table.to_pandas()
-            if 'language' not in df.columns:
-                return {}
-
-            language_counts = df.groupby('language')['file_path'].nunique().to_dict()
-            return language_counts
+            return self._files_per_language(self._scan_columns(['language', 'file_path']))
 
         except Exception as e:
             logger.error(f"Failed to get language breakdown: {e}")
@@ -304,17 +446,28 @@ class VectorDatabase:
             return {}
 
         try:
-            df = self.table.to_pandas()
-            if 'chunk_type' not in df.columns:
-                return {}
-
-            chunk_type_counts = df['chunk_type'].value_counts().to_dict()
-            return chunk_type_counts
+            return self._chunks_per_type(self._scan_columns(['chunk_type']))
 
         except Exception as e:
             logger.error(f"Failed to get chunk type breakdown: {e}")
             return {}
 
+    def get_all_stats(self) -> Dict[str, Any]:
+        # Row count and both breakdowns from a single projected scan
+        stats = {"count": 0, "language_breakdown": {}, "chunk_type_breakdown": {}}
+        if self.table is None:
+            return stats
+
+        try:
+            data = self._scan_columns(['language', 'chunk_type', 'file_path'])
+            stats["count"] = data.num_rows
+            stats["language_breakdown"] = self._files_per_language(data)
+            stats["chunk_type_breakdown"] = self._chunks_per_type(data)
+        except Exception as e:
+            logger.error(f"Failed to get table stats: {e}")
+
+        return stats
+
     def get_database_size_mb(self) -> float:
         try:
             if not self.db_path.exists():
@@ -1,9 +1,18 @@
+import copy
 import os
 import hashlib
+import importlib.util
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 import json
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 
 class ConfigMeta(type):
     _property_names = {
@@ -13,7 +22,10 @@ class ConfigMeta(type):
         'CLI_MAX_CONTENT_LENGTH', 'EMBEDDING_MODEL', 'EMBEDDING_DIM',
         'AVAILABLE_EMBEDDING_MODELS', 'AUTO_SYNC_ENABLED', 'AUTO_SYNC_DEBOUNCE_SECONDS',
         'AUTO_SYNC_BATCH_SIZE', 'DEFAULT_IGNORE_PATTERNS', 'EMBEDDING_BATCH_SIZE',
-        'RERANK_ENABLED', 'RERANK_TOP_K', 'RERANK_MODEL'
+        'RERANK_ENABLED', 'RERANK_TOP_K', 'RERANK_MODEL', 'EMBEDDING_BACKEND',
+        'ANN_INDEX_MIN_ROWS', 'ANN_INDEX_TYPE', 'SEARCH_DAEMON_AUTOSTART',
+        'SEARCH_CACHE_ENABLED', 'SEARCH_CACHE_SEMANTIC', 'SEARCH_CACHE_SIMILARITY',
+        'SEARCH_CACHE_MAX_ENTRIES'
     }
 
     def __getattribute__(cls, name):
@@ -32,6 +44,7 @@ class ConfigMeta(type):
 class AppConfig(metaclass=ConfigMeta):
     HOME_DIR = Path.home() / ".codebox"
     PROJECTS_DIR = HOME_DIR / "projects"
+    STATE_DIR = HOME_DIR / "state"
 
     _APP_NAME = "CodeBox - Your Project & LLM Friend"
     _DB_TABLE_NAME = "code_chunks"
@@ -47,6 +60,10 @@ class AppConfig(metaclass=ConfigMeta):
     _EMBEDDING_MODEL = "sfr-embedding-code-2b"
     _EMBEDDING_BATCH_SIZE = 100
 
+    # "auto" uses ONNX Runtime for models that publish a quantized ONNX export
+    # (and onnxruntime is installed), "torch" always uses the PyTorch weights
+    _EMBEDDING_BACKEND = "auto"
+
     _AVAILABLE_EMBEDDING_MODELS = {
         # === 2025 State-of-the-Art Models ===
         "sfr-embedding-code-2b": {
@@ -79,13 +96,15 @@ class AppConfig(metaclass=ConfigMeta):
             "full_name": "sentence-transformers/all-MiniLM-L6-v2",
             "dim": 384,
             "description": "Fast & lightweight (general-purpose)",
-            "trust_remote_code": False
+            "trust_remote_code": False,
+            "onnx_file": "onnx/model_qint8_avx512_vnni.onnx"
         },
         "all-mpnet-base-v2": {
             "full_name": "sentence-transformers/all-mpnet-base-v2",
             "dim": 768,
             "description": "Better quality, slower (general-purpose)",
-            "trust_remote_code": False
+            "trust_remote_code": False,
+            "onnx_file": "onnx/model_qint8_avx512_vnni.onnx"
         },
         "bge-small-en-v1.5": {
             "full_name": "BAAI/bge-small-en-v1.5",
@@ -152,13 +171,36 @@ class AppConfig(metaclass=ConfigMeta):
     _RERANK_TOP_K = 20  # Re-rank top N results
     _RERANK_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
 
+    # ANN index on the vector column
+    # Below ANN_INDEX_MIN_ROWS a flat scan is fast enough; once built, the index
+    # is rebuilt whenever the table has doubled in size since the last build.
+    # IVF_HNSW_SQ keeps int8 scalar-quantized vectors (4x less memory traffic
+    # than float32); "IVF_PQ" trades more recall for a smaller index
+    _ANN_INDEX_MIN_ROWS = 10000
+    _ANN_INDEX_TYPE = "IVF_HNSW_SQ"
+
+    # Start the search daemon from `search` when none is running
+    _SEARCH_DAEMON_AUTOSTART = False
+
+    # Search result cache (invalidated whenever the index changes)
+    # With SEARCH_CACHE_SEMANTIC, a query whose embedding has cosine >=
+    # SEARCH_CACHE_SIMILARITY with a cached one reuses its results
+    _SEARCH_CACHE_ENABLED = True
+    _SEARCH_CACHE_SEMANTIC = False
+    _SEARCH_CACHE_SIMILARITY = 0.90
+    _SEARCH_CACHE_MAX_ENTRIES = 1000
+
     _current_project_path = None
     _config_loaded = False
 
+    # metadata.json path -> ((mtime_ns, size), parsed metadata)
+    _metadata_cache = {}
+
     @classmethod
     def init_directories(cls):
         cls.HOME_DIR.mkdir(exist_ok=True, parents=True)
         cls.PROJECTS_DIR.mkdir(exist_ok=True, parents=True)
+        cls.STATE_DIR.mkdir(exist_ok=True, parents=True)
 
     @classmethod
     def get_project_hash(cls, project_path: str) -> str:
@@ -207,28 +249,35 @@ class AppConfig(metaclass=ConfigMeta):
         return projects
 
     @classmethod
-    def load_project_metadata(cls, project_path: str) -> dict:
-        metadata_file = cls.get_project_metadata_file(project_path)
-        if not metadata_file.exists():
+    def _load_metadata_file(cls, metadata_file: Path) -> dict:
+        key = str(metadata_file)
+        try:
+            file_stat = os.stat(metadata_file)
+        except OSError:
+            cls._metadata_cache.pop(key, None)
             return {}
 
+        signature = (file_stat.st_mtime_ns, file_stat.st_size)
+        cached = cls._metadata_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            return copy.deepcopy(cached[1])
+
         try:
-            with open(metadata_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            raw = metadata_file.read_bytes()
+            metadata = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
         except Exception:
             return {}
 
+        cls._metadata_cache[key] = (signature, metadata)
+        return copy.deepcopy(metadata)
+
     @classmethod
-    def load_project_metadata_by_hash(cls, project_hash: str) -> dict:
-        metadata_file = cls.PROJECTS_DIR / project_hash / "metadata.json"
-        if not metadata_file.exists():
-            return {}
+    def load_project_metadata(cls, project_path: str) -> dict:
+        return cls._load_metadata_file(cls.get_project_metadata_file(project_path))
 
-        try:
-            with open(metadata_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception:
-            return {}
+    @classmethod
+    def load_project_metadata_by_hash(cls, project_hash: str) -> dict:
+        return cls._load_metadata_file(cls.PROJECTS_DIR / project_hash / "metadata.json")
 
     @classmethod
     def save_project_metadata(cls, project_path: str, metadata: dict):
@@ -237,6 +286,7 @@ class AppConfig(metaclass=ConfigMeta):
             project_dir.mkdir(exist_ok=True, parents=True)
 
             metadata_file = cls.get_project_metadata_file(project_path)
+            cls._metadata_cache.pop(str(metadata_file), None)
             with open(metadata_file, 'w', encoding='utf-8') as f:
                 json.dump(metadata, f, indent=2, ensure_ascii=False)
         except Exception as e:
@@ -254,6 +304,18 @@ class AppConfig(metaclass=ConfigMeta):
     def get_embedding_model_info(cls, model_key: str) -> Optional[dict]:
         return cls._AVAILABLE_EMBEDDING_MODELS.get(model_key)
 
+    @classmethod
+    def get_embedding_backend(cls, model_key: str) -> Tuple[str, Optional[str]]:
+        if cls._EMBEDDING_BACKEND == "torch":
+            return ("torch", None)
+
+        model_info = cls.get_embedding_model_info(model_key) or {}
+        onnx_file = model_info.get("onnx_file")
+        if onnx_file and importlib.util.find_spec("onnxruntime") is not None:
+            return ("onnx", onnx_file)
+
+        return ("torch", None)
+
     @staticmethod
     def get_language_display_name(lang_code: str) -> str:
         return lang_code.replace('_', ' ').title()
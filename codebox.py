@@ -18,7 +18,30 @@ def run_cli(args):
             limit=args.limit,
             full_content=args.full_content,
             context=args.context,
-            output=getattr(args, 'output', 'compact')
+            output=getattr(args, 'output', 'compact'),
+            language=getattr(args, 'language', None),
+            start_daemon=args.daemon
+        )
+
+    elif args.command == "search-stream":
+        handler.search_stream(
+            mode=args.mode,
+            limit=args.limit,
+            full_content=args.full_content,
+            context=args.context,
+            output=args.output,
+            language=args.language,
+            start_daemon=args.daemon
+        )
+
+    elif args.command == "search-batch":
+        handler.search_batch(
+            mode=args.mode,
+            limit=args.limit,
+            full_content=args.full_content,
+            context=args.context,
+            output=args.output,
+            language=args.language
         )
 
     elif args.command == "index":
@@ -30,6 +53,9 @@ def run_cli(args):
     elif args.command == "stats":
         handler.stats()
 
+    elif args.command == "daemon":
+        handler.daemon()
+
 
 def main():
     try:
@@ -56,14 +82,24 @@ Examples:
   python codebox.py search "user authentication"
   python codebox.py search "login function" --mode vector --limit 5
   python codebox.py search "error handling" --output standard --context 5
+  python codebox.py search "parse config" --language python
+  python codebox.py search "parse config" --compact | jq .
+  python codebox.py search-batch --mode vector < queries.txt
+  python codebox.py search-stream < queries.txt > results.jsonl
 
   python codebox.py stats
+  python codebox.py daemon
+  python codebox.py search "user authentication" --daemon
             """
         )
 
+        output_options = argparse.ArgumentParser(add_help=False)
+        output_options.add_argument('--compact', action='store_true',
+                                    help='Always print single-line JSON (default: indented only on a terminal)')
+
         subparsers = parser.add_subparsers(dest='command', help='Command to execute')
 
-        search_parser = subparsers.add_parser('search', help='Search code')
+        search_parser = subparsers.add_parser('search', help='Search code', parents=[output_options])
         search_parser.add_argument('query', help='Search query')
         search_parser.add_argument('--mode', choices=['vector', 'keyword', 'hybrid'],
                                     default='hybrid', help='Search mode (default: hybrid)')
@@ -76,16 +112,58 @@ Examples:
         search_parser.add_argument('--output', choices=['compact', 'standard', 'verbose'],
                                     default='compact',
                                     help='Output format: compact (minimal), standard (balanced), verbose (full metadata)')
-
-        index_parser = subparsers.add_parser('index', help='Index a codebase (starts auto-sync if already indexed)')
+        search_parser.add_argument('--language', default=None,
+                                    help='Only search chunks of this language (e.g. python, typescript)')
+        search_parser.add_argument('--daemon', action='store_true',
+                                    help='Start the search daemon in the background if it is not running')
+
+        stream_parser = subparsers.add_parser('search-stream',
+                                              help='Answer each stdin line as a query, one JSON object per output line')
+        stream_parser.add_argument('--mode', choices=['vector', 'keyword', 'hybrid'],
+                                    default='hybrid', help='Search mode (default: hybrid)')
+        stream_parser.add_argument('--limit', type=int, default=10,
+                                    help='Max results per query (default: 10)')
+        stream_parser.add_argument('--full-content', action='store_true',
+                                    help='Return full code content (not truncated)')
+        stream_parser.add_argument('--context', type=int, default=0,
+                                    help='Number of context lines before/after (default: 0)')
+        stream_parser.add_argument('--output', choices=['compact', 'standard', 'verbose'],
+                                    default='compact',
+                                    help='Output format: compact (minimal), standard (balanced), verbose (full metadata)')
+        stream_parser.add_argument('--language', default=None,
+                                    help='Only search chunks of this language (e.g. python, typescript)')
+        stream_parser.add_argument('--daemon', action='store_true',
+                                    help='Start the search daemon in the background if it is not running')
+
+        batch_parser = subparsers.add_parser('search-batch', help='Search many queries read from stdin (one per line)',
+                                             parents=[output_options])
+        batch_parser.add_argument('--mode', choices=['vector', 'keyword', 'hybrid'],
+                                   default='hybrid', help='Search mode (default: hybrid)')
+        batch_parser.add_argument('--limit', type=int, default=10,
+                                   help='Max results per query (default: 10)')
+        batch_parser.add_argument('--full-content', action='store_true',
+                                   help='Return full code content (not truncated)')
+        batch_parser.add_argument('--context', type=int, default=0,
+                                   help='Number of context lines before/after (default: 0)')
+        batch_parser.add_argument('--output', choices=['compact', 'standard', 'verbose'],
+                                   default='compact',
+                                   help='Output format: compact (minimal), standard (balanced), verbose (full metadata)')
+        batch_parser.add_argument('--language', default=None,
+                                   help='Only search chunks of this language (e.g. python, typescript)')
+
+        index_parser = subparsers.add_parser('index', help='Index a codebase (starts auto-sync if already indexed)',
+                                             parents=[output_options])
         index_parser.add_argument('path', nargs='?', default=None,
                                    help='Project directory path (default: current directory)')
 
-        reindex_parser = subparsers.add_parser('reindex', help='Re-index from scratch (clears all previous data)')
+        reindex_parser = subparsers.add_parser('reindex', help='Re-index from scratch (clears all previous data)',
+                                               parents=[output_options])
         reindex_parser.add_argument('path', nargs='?', default=None,
                                      help='Project directory path (default: current directory)')
 
-        subparsers.add_parser('stats', help='Show database statistics')
+        subparsers.add_parser('stats', help='Show database statistics', parents=[output_options])
+
+        subparsers.add_parser('daemon', help='Keep search models loaded and serve searches over a local socket')
 
         args = parser.parse_args()
 
@@ -93,6 +171,10 @@ Examples:
             parser.print_help()
             sys.exit(1)
 
+        if getattr(args, 'compact', False):
+            from app.core.cli_helpers import set_compact_output
+            set_compact_output(True)
+
         run_cli(args)
 
     except Exception as e: